@@ -1,6 +1,7 @@
 """GCP cloud adaptors"""
 
 # pylint: disable=import-outside-toplevel
+import functools
 import json
 
 from sky.adaptors import common
@@ -26,6 +27,42 @@ def build(service_name: str, version: str, *args, **kwargs):
                                            **kwargs)
 
 
+@functools.lru_cache(maxsize=1)
+@common.load_lazy_modules(_LAZY_MODULES)
+def _default_credentials():
+    """Returns the default credentials, shared by all the HTTP objects.
+
+    Looking up the default credentials reads the credential files (or queries
+    the metadata server), and every new credentials object has to fetch its
+    own access token, so we only do it once per process.
+    """
+    from google import auth
+    credentials, _ = auth.default(
+        scopes=['https://www.googleapis.com/auth/cloud-platform'])
+    return credentials
+
+
+@common.load_lazy_modules(_LAZY_MODULES)
+def authorized_http(timeout: int):
+    """Builds an authorized HTTP object with the default credentials.
+
+    The object keeps its connections alive across requests, but it is not
+    thread-safe, so it should not be shared across threads.
+
+    Args:
+        timeout: Timeout in seconds for the HTTP requests.
+    """
+    import google_auth_httplib2
+    from googleapiclient import http
+
+    # build_http() excludes 308 from the redirect codes, as googleapiclient
+    # does for the HTTP objects it builds itself.
+    base_http = http.build_http()
+    base_http.timeout = timeout
+    return google_auth_httplib2.AuthorizedHttp(_default_credentials(),
+                                               http=base_http)
+
+
 @common.load_lazy_modules(_LAZY_MODULES)
 def storage_client():
     """Helper that connects to GCS Storage Client for GCS Bucket"""
@@ -61,6 +98,13 @@ def http_error_exception():
     return errors.HttpError
 
 
+@common.load_lazy_modules(_LAZY_MODULES)
+def transport_error_exception():
+    """Base exception of the HTTP transport, e.g., a failed connection."""
+    import httplib2
+    return httplib2.HttpLib2Error
+
+
 @common.load_lazy_modules(_LAZY_MODULES)
 def credential_error_exception():
     """CredentialError exception."""
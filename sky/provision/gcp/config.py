@@ -13,6 +13,10 @@ from sky.provision.gcp import instance_utils
 
 logger = logging.getLogger(__name__)
 
+# The HTTP timeout of globalOperations().wait(), which must be longer than
+# the server-side deadline of the call (~2 minutes).
+_GLOBAL_OPERATION_WAIT_HTTP_TIMEOUT = 150
+
 if typing.TYPE_CHECKING:
     import google.cloud
 
@@ -53,16 +57,27 @@ def wait_for_crm_operation(operation, crm):
 
 
 def wait_for_compute_global_operation(project_name, operation, compute):
-    """Poll for global compute operation until finished."""
+    """Wait for global compute operation until finished."""
     logger.info('wait_for_compute_global_operation: '
                 'Waiting for operation {} to finish...'.format(
                     operation['name']))
 
-    for _ in range(constants.MAX_POLLS):
-        result = (compute.globalOperations().get(
+    result = operation
+    wait_start = time.time()
+    while time.time() - wait_start < instance_utils.GCP_TIMEOUT:
+        # wait() blocks on the server side until the operation is done or a
+        # deadline (~2 minutes) is reached, so there is no need to sleep
+        # between the calls.
+        # Reference: https://cloud.google.com/compute/docs/reference/rest/v1/globalOperations/wait # pylint: disable=line-too-long
+        request = compute.globalOperations().wait(
             project=project_name,
             operation=operation['name'],
-        ).execute())
+        )
+        # The default socket timeout of googleapiclient (60s) is shorter than
+        # the server-side deadline of wait(), so raise it for this request.
+        with instance_utils.http_timeout(request,
+                                         _GLOBAL_OPERATION_WAIT_HTTP_TIMEOUT):
+            result = request.execute()
         if 'error' in result:
             raise Exception(result['error'])
 
@@ -70,8 +85,6 @@ def wait_for_compute_global_operation(project_name, operation, compute):
             logger.info('wait_for_compute_global_operation: Operation done.')
             break
 
-        time.sleep(constants.POLL_INTERVAL)
-
     return result
 
 
@@ -1,7 +1,6 @@
 """GCP instance provisioning."""
 import collections
 import copy
-from multiprocessing import pool
 import re
 import time
 from typing import Any, Callable, Dict, Iterable, List, Optional, Type
@@ -27,7 +26,7 @@ def _filter_instances(
     zone: str,
     label_filters: Dict[str, str],
     status_filters_fn: Callable[[Type[instance_utils.GCPInstance]],
-                                Optional[List[str]]],
+                                Optional[Iterable[str]]],
     included_instances: Optional[List[str]] = None,
     excluded_instances: Optional[List[str]] = None,
 ) -> Dict[Type[instance_utils.GCPInstance], List[str]]:
@@ -118,13 +117,8 @@ def _wait_for_operations(
 
     If zone is None, then the operation is global.
     """
-    op_type = 'global' if zone is None else 'zone'
     for handler, operations in handlers_to_operations.items():
-        for operation in operations:
-            logger.debug(
-                f'wait_for_compute_{op_type}_operation: '
-                f'Waiting for operation {operation["name"]} to finish...')
-            handler.wait_for_operation(operation, project_id, zone=zone)
+        handler.wait_for_operations(operations, project_id, zone=zone)
 
 
 def _get_head_instance_id(instances: List) -> Optional[str]:
@@ -420,10 +414,7 @@ def get_cluster_info(
     )
     instances: Dict[str, List[common.InstanceInfo]] = {}
     for res, insts in handler_to_instances.items():
-        with pool.ThreadPool() as p:
-            inst_info = p.starmap(res.get_instance_info,
-                                  [(project_id, zone, inst) for inst in insts])
-        instances.update(zip(insts, inst_info))
+        instances.update(res.get_instances_info(project_id, zone, insts))
 
     head_instances = _filter_instances(
         handlers,
@@ -487,8 +478,7 @@ def stop_instances(
 
     operations = collections.defaultdict(list)
     for handler, instances in handler_to_instances.items():
-        for instance in instances:
-            operations[handler].append(handler.stop(project_id, zone, instance))
+        operations[handler] = handler.stop_many(project_id, zone, instances)
     _wait_for_operations(operations, project_id, zone)
     # Check if the instance is actually stopped.
     # GCP does not fully stop an instance even after
@@ -551,18 +541,15 @@ def terminate_instances(
     operations = collections.defaultdict(list)
     errs = []
     for handler, instances in handler_to_instances.items():
-        for instance in instances:
-            try:
-                logger.debug(f'Terminating instance: {instance}.')
-                operations[handler].append(
-                    handler.terminate(project_id, zone, instance))
-            except gcp.http_error_exception() as e:
-                if _INSTANCE_RESOURCE_NOT_FOUND_PATTERN.search(
-                        e.reason) is None:
-                    errs.append(e)
-                else:
-                    logger.warning(f'Instance {instance} does not exist. '
-                                   'Skip terminating it.')
+        logger.debug(f'Terminating instances: {instances}.')
+        operations[handler], handler_errs = handler.terminate_many(
+            project_id, zone, instances)
+        for e in handler_errs:
+            if _INSTANCE_RESOURCE_NOT_FOUND_PATTERN.search(str(e)) is None:
+                errs.append(e)
+            else:
+                logger.warning('Instance does not exist. Skip terminating it: '
+                               f'{e}')
     _wait_for_operations(operations, project_id, zone)
     if errs:
         raise RuntimeError(f'Failed to terminate instances: {errs}')
@@ -599,18 +586,15 @@ def open_ports(
                            f'{cluster_name_on_cloud}.')
             continue
         else:
-            for instance in instances:
-                # Add tags for all nodes in the cluster, so the firewall rule
-                # could correctly apply to all instance in the cluster.
-                handler.add_network_tag_if_not_exist(
-                    project_id,
-                    zone,
-                    instance,
-                    tag=cluster_name_on_cloud,
-                )
-            # If we have multiple instances, they are in the same cluster,
-            # i.e. the same VPC. So we can just pick any one of them.
-            vpc_name = handler.get_vpc_name(project_id, zone, instances[0])
+            # Add tags for all nodes in the cluster, so the firewall rule
+            # could correctly apply to all instance in the cluster. The nodes
+            # are in the same cluster, i.e. the same VPC.
+            vpc_name = handler.add_network_tag_and_get_vpc_name(
+                project_id,
+                zone,
+                instances,
+                tag=cluster_name_on_cloud,
+            )
             # Use compute handler here for both Compute VM and TPU VM,
             # as firewall rules is a compute resource.
             op = compute_handler.create_or_update_firewall_rule(
@@ -1,13 +1,17 @@
 """Utilities for GCP instances."""
+from concurrent import futures
+import contextlib
 import copy
 import enum
 import functools
-from multiprocessing import pool
+import os
+import random
 import re
+import secrets
 import subprocess
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
-import uuid
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 from sky import sky_logging
 from sky.adaptors import gcp
@@ -22,6 +26,9 @@ from sky.utils import ux_utils
 # Tag for the name of the node
 INSTANCE_NAME_MAX_LEN = 64
 INSTANCE_NAME_UUID_LEN = 8
+# Number of random bytes drawn per node name. 8 bytes always encode to more
+# than INSTANCE_NAME_UUID_LEN base36 characters.
+_INSTANCE_NAME_RANDOM_BYTES = 8
 
 TPU_NODE_CREATION_FAILURE = 'Failed to provision TPU node.'
 
@@ -30,20 +37,175 @@ TPU_NODE_CREATION_FAILURE = 'Failed to provision TPU node.'
 GCP_MAX_RETRIES = 12
 GCP_CREATE_MAX_RETRIES = 5
 GCP_RETRY_INTERVAL_SECONDS = 5
+GCP_MAX_RETRY_INTERVAL_SECONDS = 30
 GCP_TIMEOUT = 300
+# Timeout for a single HTTP request. Large bulkInsert bodies and list
+# responses may take longer than the default of googleapiclient (60s).
+GCP_HTTP_TIMEOUT = 120
+# The interval between polls of pending operations starts from this value and
+# doubles after each poll, up to GCP_MAX_RETRY_INTERVAL_SECONDS.
+GCP_OPERATION_POLL_INTERVAL_SECONDS = 1
+# HTTP status codes of the errors that are worth retrying, i.e., rate limiting
+# and server-side errors.
+_TRANSIENT_HTTP_STATUS_CODES = (429, 500, 502, 503, 504)
+# The maximum number of requests in a single batch request.
+# Reference: https://cloud.google.com/compute/docs/api/how-tos/batch
+GCP_MAX_BATCH_SIZE = 1000
 
 logger = sky_logging.init_logger(__name__)
 
 _FIREWALL_RESOURCE_NOT_FOUND_PATTERN = re.compile(
     r'The resource \'projects/.*/global/firewalls/.*\' was not found')
 
+_LABELS_FINGERPRINT_INVALID = 'Labels fingerprint either invalid'
+
+# Path segments that indicate a machine/accelerator type is already a URL.
+_MACHINE_TYPE_URL_SEGMENT = '/machineTypes/'
+_ACCELERATOR_TYPE_URL_SEGMENT = '/acceleratorTypes/'
+
+# Building a discovery resource parses the whole discovery document, which is
+# expensive. The resource is not thread-safe, so we cache one per thread.
+_resource_cache = threading.local()
+
+# Thread pool shared across calls, so that the threads (and the resources
+# cached in them) are reused instead of being created for every fan-out.
+_executor: Optional[futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = futures.ThreadPoolExecutor(
+                thread_name_prefix='gcp-instance-utils')
+        return _executor
+
+
+# (project_id, zone, instance, tag) of the network tags that this process has
+# added or found on instances, to skip checking them again.
+_tagged_instances: Set[Tuple[str, str, str, str]] = set()
+_tagged_instances_lock = threading.Lock()
+
+# TPU node name -> VPC name. The network of a node cannot be changed after
+# creation, so the entries never go stale.
+_tpu_vpc_names: Dict[str, str] = {}
+_tpu_vpc_names_lock = threading.Lock()
+
+
+def _reset_resource_cache() -> None:
+    global _resource_cache
+    _resource_cache = threading.local()
+
+
+def _reset_after_fork() -> None:
+    # The threads of the executor do not exist in the forked child.
+    global _executor, _executor_lock
+    global _tagged_instances, _tagged_instances_lock
+    global _tpu_vpc_names, _tpu_vpc_names_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+    _tagged_instances = set()
+    _tagged_instances_lock = threading.Lock()
+    _tpu_vpc_names = {}
+    _tpu_vpc_names_lock = threading.Lock()
+    _reset_resource_cache()
+
+
+# The cached resources hold connections that must not be shared with a
+# forked child process.
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _build_resource(service_name: str, version: str, **kwargs):
+    """Builds a GCP discovery resource, cached per (thread, service)."""
+    resources = getattr(_resource_cache, 'resources', None)
+    if resources is None:
+        resources = {}
+        _resource_cache.resources = resources
+    key = (service_name, version)
+    resource = resources.get(key)
+    if resource is None:
+        # The HTTP object is cached together with the resource, so the
+        # connections are kept alive across the requests of the thread.
+        resource = gcp.build(service_name,
+                             version,
+                             http=gcp.authorized_http(GCP_HTTP_TIMEOUT),
+                             cache_discovery=False,
+                             **kwargs)
+        resources[key] = resource
+    return resource
+
+
+def _execute_batch(resource,
+                   requests: List,
+                   return_exceptions: bool = False) -> List[Any]:
+    """Executes the requests with batch requests, one HTTP round trip each.
+
+    Returns the responses in the same order as the requests. If any of the
+    requests fails, the first error is raised after all requests finish,
+    unless return_exceptions is True, in which case the error is returned in
+    place of the response.
+    """
+    responses: List[Any] = [None] * len(requests)
+    errors = []
+
+    def callback(request_id: str, response: dict, exception: Exception):
+        if exception is not None:
+            errors.append(exception)
+            if return_exceptions:
+                responses[int(request_id)] = exception
+            return
+        responses[int(request_id)] = response
+
+    for start in range(0, len(requests), GCP_MAX_BATCH_SIZE):
+        batch = resource.new_batch_http_request(callback=callback)
+        for i, request in enumerate(requests[start:start + GCP_MAX_BATCH_SIZE],
+                                    start):
+            batch.add(request, request_id=str(i))
+        batch.execute()
+    if errors and not return_exceptions:
+        raise errors[0]
+    missing = [i for i, response in enumerate(responses) if response is None]
+    assert not missing, f'No response for the batched requests {missing}'
+    return responses
+
+
+@contextlib.contextmanager
+def http_timeout(request, timeout: float):
+    """Temporarily overrides the timeout of the request's HTTP object.
+
+    The HTTP object is shared by all requests from the same cached resource,
+    so the original timeout is restored afterwards.
+    """
+    original_timeout = request.http.timeout
+    request.http.timeout = timeout
+    try:
+        yield
+    finally:
+        request.http.timeout = original_timeout
+
 
 def _retry_on_gcp_http_exception(
     regex: Optional[str] = None,
     max_retries: int = GCP_MAX_RETRIES,
     retry_interval_s: int = GCP_RETRY_INTERVAL_SECONDS,
+    max_retry_interval_s: int = GCP_MAX_RETRY_INTERVAL_SECONDS,
+    backoff: str = 'full_jitter',
 ):
-    """Retry a function call n-times for as long as it throws an exception."""
+    """Retry a function call n-times for as long as it throws an exception.
+
+    The interval between retries grows exponentially from
+    ``retry_interval_s`` and is capped at ``max_retry_interval_s``. Jitter is
+    applied to the interval, so that concurrent callers hitting the same
+    transient error (e.g., quota or 5xx) do not retry in lockstep:
+      - 'full_jitter': uniform in [0, min(cap, base * 2^attempt)].
+      - 'decorrelated_jitter': uniform in [base, previous interval * 3],
+        capped, which spreads out callers that keep colliding.
+    """
+    assert backoff in ('full_jitter', 'decorrelated_jitter'), backoff
+
+    pattern = re.compile(regex) if regex is not None else None
 
     def dec(func):
 
@@ -56,18 +218,31 @@ def _retry_on_gcp_http_exception(
                     return value
                 except Exception as e:  # pylint: disable=broad-except
                     if (isinstance(e, gcp.http_error_exception()) and
-                        (regex is None or re.search(regex, str(e)))):
+                        (pattern is None or pattern.search(str(e)))):
                         logger.error(
                             f'Retrying for gcp.http_error_exception: {e}')
                         return e
                     raise
 
-            for _ in range(max_retries):
+            interval: float = retry_interval_s
+            for attempt in range(max_retries):
                 ret = try_catch_exc()
                 if not isinstance(ret, Exception):
                     break
-                logger.debug(f'Retrying for exception: {ret}')
-                time.sleep(retry_interval_s)
+                if attempt == max_retries - 1:
+                    break
+                if backoff == 'decorrelated_jitter':
+                    interval = min(
+                        max_retry_interval_s,
+                        random.uniform(retry_interval_s, interval * 3))
+                else:
+                    interval = random.uniform(
+                        0,
+                        min(max_retry_interval_s,
+                            retry_interval_s * (2**attempt)))
+                logger.debug(f'Retrying for exception: {ret} '
+                             f'(backoff: {interval:.1f}s)')
+                time.sleep(interval)
             if isinstance(ret, Exception):
                 raise ret
             return ret
@@ -77,25 +252,34 @@ def _retry_on_gcp_http_exception(
     return dec
 
 
-def _generate_node_name(cluster_name: str, node_suffix: str,
-                        is_head: bool) -> str:
-    """Generate node name from labels and suffix.
+def _generate_node_names(cluster_name: str, node_suffix: str, count: int,
+                         include_head_node: bool) -> List[str]:
+    """Generate node names from labels and suffix.
 
     This is required so that the correct resource can be selected
     when the only information autoscaler has is the name of the node.
 
     The suffix is expected to be one of 'compute' or 'tpu'
-    (as in ``GCPNodeType``).
+    (as in ``GCPNodeType``). If ``include_head_node`` is True, the first
+    name is for the head node. The randomness for all the names is drawn
+    at once.
     """
-    suffix_id = common_utils.base36_encode(uuid.uuid4().hex)
-    suffix = f'-{suffix_id[:INSTANCE_NAME_UUID_LEN]}-{node_suffix}'
-    if is_head:
-        suffix = f'-head{suffix}'
-    else:
-        suffix = f'-worker{suffix}'
-    node_name = cluster_name + suffix
-    assert len(node_name) <= INSTANCE_NAME_MAX_LEN, cluster_name
-    return node_name
+    random_hex = secrets.token_hex(_INSTANCE_NAME_RANDOM_BYTES * count)
+    hex_len = _INSTANCE_NAME_RANDOM_BYTES * 2
+    node_names = []
+    for i in range(count):
+        start = i * hex_len
+        random_part = random_hex[start:start + hex_len]
+        suffix_id = common_utils.base36_encode(random_part)
+        suffix = f'-{suffix_id[:INSTANCE_NAME_UUID_LEN]}-{node_suffix}'
+        if include_head_node and i == 0:
+            suffix = f'-head{suffix}'
+        else:
+            suffix = f'-worker{suffix}'
+        node_name = cluster_name + suffix
+        assert len(node_name) <= INSTANCE_NAME_MAX_LEN, cluster_name
+        node_names.append(node_name)
+    return node_names
 
 
 def _format_and_log_message_from_errors(errors: List[Dict[str, str]], e: Any,
@@ -114,6 +298,9 @@ def _format_and_log_message_from_errors(errors: List[Dict[str, str]], e: Any,
     return msg
 
 
+# Selflinks of the machine, accelerator and disk types repeat across the
+# nodes of a cluster.
+@functools.lru_cache(maxsize=1024)
 def selflink_to_name(selflink: str) -> str:
     """Converts a selflink to a name.
 
@@ -126,6 +313,32 @@ def selflink_to_name(selflink: str) -> str:
     return selflink.rsplit('/', 1)[-1]
 
 
+def _copy_node_config(node_config: dict) -> dict:
+    """Copies a compute node config for creating instances.
+
+    This is much cheaper than ``copy.deepcopy`` on large node configs (e.g.,
+    with startup scripts in the metadata). Only the nested fields that are
+    modified in place when creating instances are cloned: the accelerator
+    types, the disk types and the reservation values.
+    """
+    config = dict(node_config)
+    if 'guestAccelerators' in config:
+        config['guestAccelerators'] = [
+            dict(accelerator) for accelerator in config['guestAccelerators']
+        ]
+    if 'disks' in config:
+        disks = []
+        for disk in config['disks']:
+            disk = dict(disk)
+            if 'initializeParams' in disk:
+                disk['initializeParams'] = dict(disk['initializeParams'])
+            disks.append(disk)
+        config['disks'] = disks
+    if 'reservationAffinity' in config:
+        config['reservationAffinity'] = dict(config['reservationAffinity'])
+    return config
+
+
 def instance_to_handler(instance: str):
     instance_type = instance.split('-')[-1]
     if instance_type == 'compute':
@@ -141,8 +354,9 @@ def instance_to_handler(instance: str):
 class GCPInstance:
     """Base class for GCP instance handlers."""
     PENDING_STATES: List[str] = []
-    NEED_TO_STOP_STATES: List[str] = []
-    NON_STOPPED_STATES: List[str] = []
+    # Sets for fast membership tests; they are also valid status filters.
+    NEED_TO_STOP_STATES: FrozenSet[str] = frozenset()
+    NON_STOPPED_STATES: FrozenSet[str] = frozenset()
     NEED_TO_TERMINATE_STATES: List[str] = []
     RUNNING_STATE: str = ''
     STOPPING_STATES: List[str] = []
@@ -153,8 +367,8 @@ class GCPInstance:
     def load_resource(cls):
         """Load the GCP API for the instance type.
 
-        Do not cache the resource object, as it will not work
-        when multiple threads are running.
+        The resource object is not thread-safe, so it is cached per thread
+        (see ``_build_resource``) and must not be shared across threads.
         """
         raise NotImplementedError
 
@@ -176,6 +390,38 @@ class GCPInstance:
     ) -> dict:
         raise NotImplementedError
 
+    @classmethod
+    def stop_many(
+        cls,
+        project_id: str,
+        zone: str,
+        instances: List[str],
+    ) -> List[dict]:
+        """Stops the instances and returns the operations."""
+        return [cls.stop(project_id, zone, instance) for instance in instances]
+
+    @classmethod
+    def terminate_many(
+        cls,
+        project_id: str,
+        zone: str,
+        instances: List[str],
+    ) -> Tuple[List[dict], List[Exception]]:
+        """Terminates the instances.
+
+        Returns:
+            The operations of the instances being terminated, and the HTTP
+            errors of the instances that failed to be terminated.
+        """
+        operations = []
+        errors: List[Exception] = []
+        for instance in instances:
+            try:
+                operations.append(cls.terminate(project_id, zone, instance))
+            except gcp.http_error_exception() as e:
+                errors.append(e)
+        return operations, errors
+
     @classmethod
     def wait_for_operation(cls,
                            operation: dict,
@@ -184,13 +430,27 @@ class GCPInstance:
                            zone: Optional[str] = None) -> None:
         raise NotImplementedError
 
+    @classmethod
+    def wait_for_operations(cls,
+                            operations: List[dict],
+                            project_id: str,
+                            zone: Optional[str] = None) -> None:
+        """Poll for the operations until all of them are finished.
+
+        If zone is None, then the operations are global.
+        """
+        for operation in operations:
+            logger.debug(f'wait_for_operations: Waiting for operation '
+                         f'{operation["name"]} to finish...')
+            cls.wait_for_operation(operation, project_id, zone=zone)
+
     @classmethod
     def filter(
         cls,
         project_id: str,
         zone: str,
         label_filters: Optional[Dict[str, str]],
-        status_filters: Optional[List[str]],
+        status_filters: Optional[Iterable[str]],
         included_instances: Optional[List[str]] = None,
         excluded_instances: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
@@ -234,6 +494,34 @@ class GCPInstance:
     ) -> None:
         raise NotImplementedError
 
+    @classmethod
+    def add_network_tag_if_not_exist_bulk(
+        cls,
+        project_id: str,
+        zone: str,
+        instances: List[str],
+        tag: str,
+    ) -> None:
+        """Adds the network tag to the instances that do not have it yet."""
+        for instance in instances:
+            cls.add_network_tag_if_not_exist(project_id, zone, instance, tag)
+
+    @classmethod
+    def add_network_tag_and_get_vpc_name(
+        cls,
+        project_id: str,
+        zone: str,
+        instances: List[str],
+        tag: str,
+    ) -> str:
+        """Adds the network tag to the instances and returns their VPC name.
+
+        The instances are expected to be in the same cluster, i.e. the same
+        VPC, so the VPC name of the first instance is returned.
+        """
+        cls.add_network_tag_if_not_exist_bulk(project_id, zone, instances, tag)
+        return cls.get_vpc_name(project_id, zone, instances[0])
+
     @classmethod
     def create_instances(
         cls,
@@ -299,6 +587,16 @@ class GCPInstance:
                           instance_id: str) -> List[common.InstanceInfo]:
         raise NotImplementedError
 
+    @classmethod
+    def get_instances_info(
+            cls, project_id: str, availability_zone: str,
+            instance_ids: List[str]) -> Dict[str, List[common.InstanceInfo]]:
+        """Returns the info of multiple instances, keyed by instance id."""
+        instances_info = _get_executor().map(
+            lambda instance_id: cls.get_instance_info(
+                project_id, availability_zone, instance_id), instance_ids)
+        return dict(zip(instance_ids, instances_info))
+
     @classmethod
     def resize_disk(cls, project_id: str, availability_zone: str,
                     node_config: dict, instance_name: str) -> None:
@@ -315,16 +613,13 @@ class GCPComputeInstance(GCPInstance):
     STOPPED_STATES = ['TERMINATED', 'SUSPENDED']
     RUNNING_STATE = 'RUNNING'
     STATUS_FIELD = 'status'
-    NEED_TO_STOP_STATES = PENDING_STATES + [RUNNING_STATE]
+    NEED_TO_STOP_STATES = frozenset(PENDING_STATES + [RUNNING_STATE])
 
-    NON_STOPPED_STATES = NEED_TO_STOP_STATES + STOPPING_STATES
+    NON_STOPPED_STATES = NEED_TO_STOP_STATES | frozenset(STOPPING_STATES)
 
     @classmethod
     def load_resource(cls):
-        return gcp.build('compute',
-                         'v1',
-                         credentials=None,
-                         cache_discovery=False)
+        return _build_resource('compute', 'v1')
 
     @classmethod
     def stop(
@@ -365,53 +660,66 @@ class GCPComputeInstance(GCPInstance):
         project_id: str,
         zone: str,
         label_filters: Optional[Dict[str, str]],
-        status_filters: Optional[List[str]],
+        status_filters: Optional[Iterable[str]],
         included_instances: Optional[List[str]] = None,
         excluded_instances: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        if label_filters:
-            label_filter_expr = ('(' + ' AND '.join([
-                '(labels.{key} = {value})'.format(key=key, value=value)
-                for key, value in label_filters.items()
-            ]) + ')')
-        else:
-            label_filter_expr = ''
-
-        if status_filters:
-            instance_state_filter_expr = ('(' + ' OR '.join([
-                '(status = {status})'.format(status=status)
-                for status in status_filters
-            ]) + ')')
-        else:
-            instance_state_filter_expr = ''
-
-        not_empty_filters = [
-            f for f in [
-                label_filter_expr,
-                instance_state_filter_expr,
-            ] if f
-        ]
-
-        filter_expr = ' AND '.join(not_empty_filters)
-
+        filter_expr = cls._get_filter_expr(label_filters, status_filters,
+                                           included_instances,
+                                           excluded_instances)
+        kwargs = {} if filter_expr is None else {'filter': filter_expr}
         response = (cls.load_resource().instances().list(
             project=project_id,
-            filter=filter_expr,
             zone=zone,
+            **kwargs,
         ).execute(num_retries=GCP_MAX_RETRIES))
         instances = response.get('items', [])
-        instances = {i['name']: i for i in instances}
+        return cls._filter_instance_names(instances, included_instances,
+                                          excluded_instances)
+
+    @staticmethod
+    def _get_filter_expr(
+        label_filters: Optional[Dict[str, str]],
+        status_filters: Optional[Iterable[str]],
+        included_instances: Optional[List[str]],
+        excluded_instances: Optional[List[str]],
+    ) -> Optional[str]:
+        """Returns the filter expression, or None if nothing is filtered."""
+        filters = [
+            f'(labels.{key} = {value})'
+            for key, value in (label_filters or {}).items()
+        ]
+        if status_filters:
+            filters.append('(' + ' OR '.join(
+                f'(status = {status})' for status in status_filters) + ')')
+        # Filter by name on the server side, so that we do not need to fetch
+        # all the instances in the zone.
         if included_instances:
-            instances = {
-                k: v for k, v in instances.items() if k in included_instances
+            filters.append('(' + ' OR '.join(
+                f'(name = "{name}")' for name in included_instances) + ')')
+        if excluded_instances:
+            filters.extend(f'(name != "{name}")' for name in excluded_instances)
+        return ' AND '.join(filters) if filters else None
+
+    @staticmethod
+    def _filter_instance_names(
+        instances: List[Dict[str, Any]],
+        included_instances: Optional[List[str]],
+        excluded_instances: Optional[List[str]],
+    ) -> Dict[str, Any]:
+        instances_by_name = {i['name']: i for i in instances}
+        # The names are already filtered by the API; this is only a safeguard.
+        if included_instances:
+            included = set(included_instances)
+            instances_by_name = {
+                k: v for k, v in instances_by_name.items() if k in included
             }
         if excluded_instances:
-            instances = {
-                k: v
-                for k, v in instances.items()
-                if k not in excluded_instances
+            excluded = set(excluded_instances)
+            instances_by_name = {
+                k: v for k, v in instances_by_name.items() if k not in excluded
             }
-        return instances
+        return instances_by_name
 
     @classmethod
     def wait_for_operation(cls,
@@ -440,8 +748,8 @@ class GCPComputeInstance(GCPInstance):
                 operation=operation['name'],
                 **kwargs,
             )
-            request.http.timeout = timeout
-            return request.execute(num_retries=GCP_MAX_RETRIES)
+            with http_timeout(request, timeout):
+                return request.execute(num_retries=GCP_MAX_RETRIES)
 
         wait_start = time.time()
         while time.time() - wait_start < timeout:
@@ -493,6 +801,29 @@ class GCPComputeInstance(GCPInstance):
             error.errors = errors
             raise error
 
+    @classmethod
+    def get_instance_metadata(
+        cls,
+        project_id: str,
+        zone: str,
+        instance: str,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Gets the instance resource, restricted to `fields` if specified.
+
+        `fields` is a partial response mask, e.g. 'networkInterfaces(network)'.
+        Reference: https://cloud.google.com/compute/docs/api/how-tos/performance#partial # pylint: disable=line-too-long
+        """
+        kwargs = {}
+        if fields is not None:
+            kwargs['fields'] = fields
+        return cls.load_resource().instances().get(
+            project=project_id,
+            zone=zone,
+            instance=instance,
+            **kwargs,
+        ).execute()
+
     @classmethod
     def get_vpc_name(
         cls,
@@ -501,11 +832,12 @@ class GCPComputeInstance(GCPInstance):
         instance: str,
     ) -> str:
         try:
-            response = cls.load_resource().instances().get(
-                project=project_id,
-                zone=zone,
-                instance=instance,
-            ).execute()
+            response = cls.get_instance_metadata(
+                project_id,
+                zone,
+                instance,
+                fields='networkInterfaces(network)',
+            )
             # Format: projects/PROJECT_ID/global/networks/VPC_NAME
             vpc_link = response['networkInterfaces'][0]['network']
             return selflink_to_name(vpc_link)
@@ -522,18 +854,35 @@ class GCPComputeInstance(GCPInstance):
         instance: str,
         tag: str,
     ) -> None:
-        try:
-            # If we have multiple instances, they are in the same cluster,
-            # i.e. the same VPC. So we can just pick one.
-            response = cls.load_resource().instances().get(
-                project=project_id,
-                zone=zone,
-                instance=instance,
-            ).execute()
-            existing_tags = response['tags'].get('items', [])
-            if tag in existing_tags:
+        with _tagged_instances_lock:
+            if (project_id, zone, instance, tag) in _tagged_instances:
                 return
-            update_body = response['tags']
+        try:
+            response = cls.get_instance_metadata(project_id,
+                                                 zone,
+                                                 instance,
+                                                 fields='tags')
+            cls._add_network_tag(project_id, zone, instance, tag,
+                                 response['tags'])
+        except gcp.http_error_exception() as e:
+            with ux_utils.print_exception_no_traceback():
+                raise ValueError(
+                    f'Failed to add network tags for instance {instance}'
+                ) from e
+
+    @classmethod
+    def _add_network_tag(
+        cls,
+        project_id: str,
+        zone: str,
+        instance: str,
+        tag: str,
+        tags: Dict[str, Any],
+    ) -> None:
+        """Adds the tag to the instance, given its current `tags` resource."""
+        existing_tags = tags.get('items', [])
+        if tag not in existing_tags:
+            update_body = tags
             update_body['items'] = existing_tags
             update_body['items'].append(tag)
             cls.load_resource().instances().setTags(
@@ -542,11 +891,41 @@ class GCPComputeInstance(GCPInstance):
                 instance=instance,
                 body=update_body,
             ).execute()
+        with _tagged_instances_lock:
+            _tagged_instances.add((project_id, zone, instance, tag))
+
+    @classmethod
+    def add_network_tag_and_get_vpc_name(
+        cls,
+        project_id: str,
+        zone: str,
+        instances: List[str],
+        tag: str,
+    ) -> str:
+        """Adds the network tag to the instances and returns their VPC name.
+
+        The tags and the VPC of the first instance are fetched with a single
+        get request.
+        """
+        first_instance = instances[0]
+        try:
+            response = cls.get_instance_metadata(
+                project_id,
+                zone,
+                first_instance,
+                fields='tags,networkInterfaces(network)',
+            )
+            cls._add_network_tag(project_id, zone, first_instance, tag,
+                                 response['tags'])
         except gcp.http_error_exception() as e:
             with ux_utils.print_exception_no_traceback():
                 raise ValueError(
-                    f'Failed to add network tags for instance {instance}'
+                    f'Failed to add network tags for instance {first_instance}'
                 ) from e
+        cls.add_network_tag_if_not_exist_bulk(project_id, zone, instances[1:],
+                                              tag)
+        # Format: projects/PROJECT_ID/global/networks/VPC_NAME
+        return selflink_to_name(response['networkInterfaces'][0]['network'])
 
     @classmethod
     def delete_firewall_rule(
@@ -554,18 +933,18 @@ class GCPComputeInstance(GCPInstance):
         project_id: str,
         firewall_rule_name: str,
     ) -> None:
-        rule = cls.load_resource().firewalls().list(
-            project=project_id, filter=f'name={firewall_rule_name}').execute()
-        # For the return value format, please refer to
-        # https://developers.google.com/resources/api-libraries/documentation/compute/alpha/python/latest/compute_alpha.firewalls.html#list # pylint: disable=line-too-long
-        if 'items' not in rule:
+        # Delete directly instead of checking the existence first, as a
+        # non-existent rule results in a not-found error.
+        try:
+            cls.load_resource().firewalls().delete(
+                project=project_id,
+                firewall=firewall_rule_name,
+            ).execute()
+        except gcp.http_error_exception() as e:
+            if _FIREWALL_RESOURCE_NOT_FOUND_PATTERN.search(e.reason) is None:
+                raise
             logger.warning(f'Firewall rule {firewall_rule_name} not found. '
                            'Skip cleanup.')
-            return
-        cls.load_resource().firewalls().delete(
-            project=project_id,
-            firewall=firewall_rule_name,
-        ).execute()
 
     @classmethod
     def create_or_update_firewall_rule(
@@ -576,11 +955,12 @@ class GCPComputeInstance(GCPInstance):
         cluster_name_on_cloud: str,
         ports: List[str],
     ) -> dict:
+        firewalls = cls.load_resource().firewalls()
         try:
-            body = cls.load_resource().firewalls().get(
-                project=project_id, firewall=firewall_rule_name).execute()
+            body = firewalls.get(project=project_id,
+                                 firewall=firewall_rule_name).execute()
             body['allowed'][0]['ports'] = ports
-            operation = cls.load_resource().firewalls().update(
+            operation = firewalls.update(
                 project=project_id,
                 firewall=firewall_rule_name,
                 body=body,
@@ -607,28 +987,64 @@ class GCPComputeInstance(GCPInstance):
                 'sourceRanges': ['0.0.0.0/0'],
                 'targetTags': [cluster_name_on_cloud],
             }
-            operation = cls.load_resource().firewalls().insert(
+            operation = firewalls.insert(
                 project=project_id,
                 body=body,
             ).execute()
         return operation
 
+    @classmethod
+    def set_labels(cls,
+                   project_id: str,
+                   availability_zone: str,
+                   node_id: str,
+                   labels: dict,
+                   label_fingerprint: Optional[str] = None,
+                   existing_labels: Optional[Dict[str, str]] = None) -> None:
+        """Adds labels to an instance.
+
+        If both ``label_fingerprint`` and ``existing_labels`` are provided
+        (e.g., from an instance returned by ``filter()``), the instance is not
+        fetched again. If the fingerprint is stale, we fall back to fetching
+        the instance.
+        """
+        if label_fingerprint is not None and existing_labels is not None:
+            try:
+                cls._set_labels(project_id, availability_zone, node_id,
+                                dict(existing_labels, **labels),
+                                label_fingerprint)
+                return
+            except gcp.http_error_exception() as e:
+                if _LABELS_FINGERPRINT_INVALID not in str(e):
+                    raise
+                logger.debug(f'set_labels: Labels of {node_id} have changed. '
+                             f'Fetching the instance again: {e}')
+        cls._fetch_and_set_labels(project_id, availability_zone, node_id,
+                                  labels)
+
     @classmethod
     # When there is a cloud function running in parallel to set labels for
     # newly created instances, it may fail with the following error:
     #   "Labels fingerprint either invalid or resource labels have changed"
     # We should retry until the labels are set successfully.
-    @_retry_on_gcp_http_exception('Labels fingerprint either invalid')
-    def set_labels(cls, project_id: str, availability_zone: str, node_id: str,
-                   labels: dict) -> None:
+    @_retry_on_gcp_http_exception(_LABELS_FINGERPRINT_INVALID)
+    def _fetch_and_set_labels(cls, project_id: str, availability_zone: str,
+                              node_id: str, labels: dict) -> None:
         node = cls.load_resource().instances().get(
             project=project_id,
             instance=node_id,
             zone=availability_zone,
         ).execute(num_retries=GCP_CREATE_MAX_RETRIES)
+        cls._set_labels(project_id, availability_zone, node_id,
+                        dict(node['labels'], **labels),
+                        node['labelFingerprint'])
+
+    @classmethod
+    def _set_labels(cls, project_id: str, availability_zone: str, node_id: str,
+                    labels: dict, label_fingerprint: str) -> None:
         body = {
-            'labels': dict(node['labels'], **labels),
-            'labelFingerprint': node['labelFingerprint'],
+            'labels': labels,
+            'labelFingerprint': label_fingerprint,
         }
         operation = (cls.load_resource().instances().setLabels(
             project=project_id,
@@ -654,7 +1070,7 @@ class GCPComputeInstance(GCPInstance):
         # NOTE: The syntax for bulkInsert() is different from insert().
         # bulkInsert expects resource names without prefix. Otherwise
         # it causes a 503 error.
-        config = copy.deepcopy(node_config)
+        config = _copy_node_config(node_config)
 
         # removing TPU-specific default key set in config.py
         config.pop('networkConfig', None)
@@ -663,19 +1079,19 @@ class GCPComputeInstance(GCPInstance):
         if include_head_node:
             head_tag_needed[0] = True
 
-        names = []
-        for i in range(count):
-            names.append(
-                _generate_node_name(cluster_name,
-                                    GCPNodeType.COMPUTE.value,
-                                    is_head=head_tag_needed[i]))
+        names = _generate_node_names(cluster_name, GCPNodeType.COMPUTE.value,
+                                     count, include_head_node)
 
         labels = dict(config.get('labels', {}), **labels)
 
         config.update({
             'labels': dict(
-                labels, **{
+                labels,
+                **{
                     provision_constants.TAG_RAY_CLUSTER_NAME: cluster_name,
+                    # Assume all nodes are workers, so that only the head node
+                    # needs its labels updated once the instances are created.
+                    **provision_constants.WORKER_NODE_TAGS,
                     provision_constants.TAG_SKYPILOT_CLUSTER_NAME: cluster_name
                 }),
         })
@@ -739,25 +1155,26 @@ class GCPComputeInstance(GCPInstance):
                 config: dict) -> List[dict]:
         # Convert name to selflink
         existing_machine_type = config['machineType']
-        if not re.search('.*/machineTypes/.*', existing_machine_type):
+        if _MACHINE_TYPE_URL_SEGMENT not in existing_machine_type:
             config['machineType'] = (
                 f'zones/{zone}/machineTypes/{config["machineType"]}')
 
         for accelerator in config.get('guestAccelerators', []):
             gpu_type = accelerator['acceleratorType']
-            if not re.search('.*/acceleratorTypes/.*', gpu_type):
+            if _ACCELERATOR_TYPE_URL_SEGMENT not in gpu_type:
                 accelerator['acceleratorType'] = (
                     f'projects/{project_id}/zones/{zone}/'
                     f'acceleratorTypes/{gpu_type}')
 
         logger.debug('Launching GCP instances with "insert" ...')
+        instances = cls.load_resource().instances()
         operations = []
         for name in names:
             body = {
                 'name': name,
                 **config,
             }
-            request = cls.load_resource().instances().insert(
+            request = instances.insert(
                 project=project_id,
                 zone=zone,
                 body=body,
@@ -898,11 +1315,11 @@ class GCPComputeInstance(GCPInstance):
         except gcp.http_error_exception() as e:
             return _handle_http_error(e)
 
-        # assign labels for head node
-        with pool.ThreadPool() as p:
-            p.starmap(cls.create_node_tag,
-                      [(project_id, zone, names[i], head_tag_needed[i])
-                       for i in range(len(names))])
+        # Worker labels are already set at creation; assign labels for the
+        # head node.
+        for name, is_head in zip(names, head_tag_needed):
+            if is_head:
+                cls.create_node_tag(project_id, zone, name, is_head=True)
         return None
 
     @classmethod
@@ -923,6 +1340,30 @@ class GCPComputeInstance(GCPInstance):
             zone=availability_zone,
             instance=instance_id,
         ).execute()
+        return cls._to_instance_info(instance_id, result)
+
+    @classmethod
+    def get_instances_info(
+            cls, project_id: str, availability_zone: str,
+            instance_ids: List[str]) -> Dict[str, List[common.InstanceInfo]]:
+        resource = cls.load_resource()
+        instances = resource.instances()
+        requests = [
+            instances.get(
+                project=project_id,
+                zone=availability_zone,
+                instance=instance_id,
+            ) for instance_id in instance_ids
+        ]
+        results = _execute_batch(resource, requests)
+        return {
+            instance_id: cls._to_instance_info(instance_id, result)
+            for instance_id, result in zip(instance_ids, results)
+        }
+
+    @staticmethod
+    def _to_instance_info(instance_id: str,
+                          result: dict) -> List[common.InstanceInfo]:
         external_ip = (result.get('networkInterfaces',
                                   [{}])[0].get('accessConfigs',
                                                [{}])[0].get('natIP', None))
@@ -945,8 +1386,9 @@ class GCPComputeInstance(GCPInstance):
         # Extract the specified disk size from the configuration
         new_size_gb = node_config['disks'][0]['initializeParams']['diskSizeGb']
 
+        resource = cls.load_resource()
         # Fetch the instance details to get the disk name and current disk size
-        response = (cls.load_resource().instances().get(
+        response = (resource.instances().get(
             project=project_id,
             zone=availability_zone,
             instance=instance_name,
@@ -955,7 +1397,7 @@ class GCPComputeInstance(GCPInstance):
 
         try:
             # Execute the resize request and return the response
-            operation = (cls.load_resource().disks().resize(
+            operation = (resource.disks().resize(
                 project=project_id,
                 zone=availability_zone,
                 disk=disk_name,
@@ -991,7 +1433,7 @@ class GCPManagedInstanceGroup(GCPComputeInstance):
         include_head_node: bool,
     ) -> Tuple[Optional[List], List[str]]:
         logger.debug(f'Creating cluster with MIG: {cluster_name!r}')
-        config = copy.deepcopy(node_config)
+        config = _copy_node_config(node_config)
         labels = dict(config.get('labels', {}), **labels)
 
         config.update({
@@ -1176,11 +1618,13 @@ class GCPManagedInstanceGroup(GCPComputeInstance):
             head_instance_name = list(pending_running_instances.keys())[0]
         # We need to update the node's label if mig already exists, as the
         # config is not updated during the resize operation.
-        for instance_name in pending_running_instances.keys():
+        for instance_name, instance in pending_running_instances.items():
             cls.set_labels(project_id=project_id,
                            availability_zone=zone,
                            node_id=instance_name,
-                           labels=labels)
+                           labels=labels,
+                           label_fingerprint=instance.get('labelFingerprint'),
+                           existing_labels=instance.get('labels', {}))
 
         pending_running_instance_names = list(pending_running_instances.keys())
         pending_running_instance_names.remove(head_instance_name)
@@ -1195,19 +1639,41 @@ class GCPTPUVMInstance(GCPInstance):
     STOPPING_STATES = ['STOPPING']
     STOPPED_STATES = ['STOPPED']
     STATUS_FIELD = 'state'
-    NEED_TO_STOP_STATES = PENDING_STATES + [RUNNING_STATE]
+    NEED_TO_STOP_STATES = frozenset(PENDING_STATES + [RUNNING_STATE])
 
-    NON_STOPPED_STATES = NEED_TO_STOP_STATES + STOPPING_STATES
+    NON_STOPPED_STATES = NEED_TO_STOP_STATES | frozenset(STOPPING_STATES)
 
     @classmethod
     def load_resource(cls):
-        return gcp.build(
+        return _build_resource(
             'tpu',
             constants.TPU_VM_VERSION,
-            credentials=None,
-            cache_discovery=False,
             discoveryServiceUrl='https://tpu.googleapis.com/$discovery/rest')
 
+    @classmethod
+    def _collections(cls) -> Tuple[Any, Any]:
+        """Returns the (nodes, operations) collections, cached per thread.
+
+        Each hop of resource.projects().locations().nodes() builds a new
+        collection object, so we keep the resolved ones along with the
+        resource they are built from.
+        """
+        resource = cls.load_resource()
+        cached = getattr(_resource_cache, 'tpu_collections', None)
+        if cached is None or cached[0] is not resource:
+            locations = resource.projects().locations()
+            cached = (resource, locations.nodes(), locations.operations())
+            _resource_cache.tpu_collections = cached
+        return cached[1], cached[2]
+
+    @classmethod
+    def _nodes(cls):
+        return cls._collections()[0]
+
+    @classmethod
+    def _operations(cls):
+        return cls._collections()[1]
+
     @classmethod
     def wait_for_operation(cls,
                            operation: dict,
@@ -1215,27 +1681,74 @@ class GCPTPUVMInstance(GCPInstance):
                            region: Optional[str] = None,
                            zone: Optional[str] = None) -> None:
         """Poll for TPU operation until finished."""
-        del project_id, region, zone  # unused
+        del region  # unused
+        cls.wait_for_operations([operation], project_id, zone)
 
-        @_retry_on_gcp_http_exception(
-            f'Failed to wait for operation {operation["name"]}')
-        def call_operation(fn, timeout: int):
-            request = fn(name=operation['name'])
-            request.http.timeout = timeout
-            return request.execute(num_retries=GCP_MAX_RETRIES)
+    @classmethod
+    def wait_for_operations(cls,
+                            operations: List[dict],
+                            project_id: str,
+                            zone: Optional[str] = None) -> None:
+        """Poll for the TPU operations together until all are finished."""
+        del project_id, zone  # unused
+        for result in cls._poll_operations(operations, GCP_TIMEOUT):
+            cls._check_operation_result(result)
+
+    @classmethod
+    def _poll_operations(cls, operations: List[dict],
+                         timeout: float) -> List[dict]:
+        """Polls the operations until all of them are done or timeout.
+
+        The pending operations are polled together with one batch request,
+        with jittered exponential backoff between the polls. A poll failing
+        with a transient HTTP error (429 or 5xx) or a connection error is
+        retried by the next poll.
 
+        Returns:
+            The latest result of each operation, in the same order.
+        """
+        results = list(operations)
+        resource = cls.load_resource()
+        operations_api = cls._operations()
         wait_start = time.time()
-        while time.time() - wait_start < GCP_TIMEOUT:
-            timeout = max(GCP_TIMEOUT - (time.time() - wait_start), 1)
-            result = call_operation(
-                cls.load_resource().projects().locations().operations().get,
-                timeout)
-            if result['done']:
+        attempt = 0
+        while True:
+            pending = [i for i, r in enumerate(results) if not r.get('done')]
+            remaining = timeout - (time.time() - wait_start)
+            if not pending or remaining <= 0:
                 break
-            logger.debug('wait_for_tpu_operation: '
-                         f'Waiting for operation {operation["name"]} to '
-                         'finish ...')
-
+            if attempt > 0:
+                interval = min(
+                    GCP_MAX_RETRY_INTERVAL_SECONDS,
+                    GCP_OPERATION_POLL_INTERVAL_SECONDS * 2**(attempt - 1))
+                logger.debug(f'_poll_operations: Waiting for {len(pending)} '
+                             'operations to finish ...')
+                time.sleep(
+                    min(random.uniform(interval / 2, interval), remaining))
+            attempt += 1
+            try:
+                responses = _execute_batch(resource, [
+                    operations_api.get(name=results[i]['name']) for i in pending
+                ])
+            except (gcp.http_error_exception(), gcp.transport_error_exception(),
+                    OSError) as e:
+                # Transient errors are retried with the next poll, so that the
+                # retries are bounded by the timeout as well. Batch requests
+                # do not take num_retries, so errors of the connection itself,
+                # e.g., a dropped keep-alive connection, are retried here too.
+                # socket.timeout, ConnectionError and ssl.SSLError are all
+                # subclasses of OSError.
+                if (isinstance(e, gcp.http_error_exception()) and
+                        e.resp.status not in _TRANSIENT_HTTP_STATUS_CODES):
+                    raise
+                logger.debug(f'_poll_operations: Retrying for error: {e}')
+                continue
+            for i, response in zip(pending, responses):
+                results[i] = response
+        return results
+
+    @staticmethod
+    def _check_operation_result(result: dict) -> None:
         if 'error' in result:
             error = common.ProvisionerError('Operation failed')
             errors = []
@@ -1255,7 +1768,7 @@ class GCPTPUVMInstance(GCPInstance):
 
         if 'response' in result:
             logger.debug('wait_for_tpu_operation: '
-                         f'Operation {operation["name"]} finished.')
+                         f'Operation {result["name"]} finished.')
 
     @classmethod
     def filter(
@@ -1263,14 +1776,14 @@ class GCPTPUVMInstance(GCPInstance):
         project_id: str,
         zone: str,
         label_filters: Optional[Dict[str, str]],
-        status_filters: Optional[List[str]],
+        status_filters: Optional[Iterable[str]],
         included_instances: Optional[List[str]] = None,
         excluded_instances: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         path = f'projects/{project_id}/locations/{zone}'
         try:
-            response = (cls.load_resource().projects().locations().nodes().list(
-                parent=path).execute(num_retries=GCP_MAX_RETRIES))
+            response = (cls._nodes().list(parent=path).execute(
+                num_retries=GCP_MAX_RETRIES))
         except gcp.http_error_exception() as e:
             # SKY: Catch HttpError when accessing unauthorized region.
             # Return empty dict instead of raising exception to not break.
@@ -1308,32 +1821,52 @@ class GCPTPUVMInstance(GCPInstance):
         instances = {i['name']: i for i in instances}
 
         if included_instances:
-            instances = {
-                k: v for k, v in instances.items() if k in included_instances
-            }
+            included = set(included_instances)
+            instances = {k: v for k, v in instances.items() if k in included}
         if excluded_instances:
+            excluded = set(excluded_instances)
             instances = {
-                k: v
-                for k, v in instances.items()
-                if k not in excluded_instances
+                k: v for k, v in instances.items() if k not in excluded
             }
         return instances
 
     @classmethod
     def stop(cls, project_id: str, zone: str, instance: str) -> dict:
         """Stop a TPU VM."""
+        return cls.stop_many(project_id, zone, [instance])[0]
+
+    @classmethod
+    def stop_many(cls, project_id: str, zone: str,
+                  instances: List[str]) -> List[dict]:
+        """Stop the TPU VMs with batch requests."""
         del project_id, zone  # unused
-        operation = cls.load_resource().projects().locations().nodes().stop(
-            name=instance).execute()
-        return operation
+        nodes = cls._nodes()
+        return _execute_batch(
+            cls.load_resource(),
+            [nodes.stop(name=instance) for instance in instances])
 
     @classmethod
     def terminate(cls, project_id: str, zone: str, instance: str) -> dict:
         """Terminate a TPU VM."""
+        operations, errors = cls.terminate_many(project_id, zone, [instance])
+        if errors:
+            raise errors[0]
+        return operations[0]
+
+    @classmethod
+    def terminate_many(
+            cls, project_id: str, zone: str,
+            instances: List[str]) -> Tuple[List[dict], List[Exception]]:
+        """Terminate the TPU VMs with batch requests."""
         del project_id, zone  # unused
-        operation = cls.load_resource().projects().locations().nodes().delete(
-            name=instance).execute()
-        return operation
+        nodes = cls._nodes()
+        responses = _execute_batch(
+            cls.load_resource(),
+            [nodes.delete(name=instance) for instance in instances],
+            return_exceptions=True)
+        operations = [r for r in responses if not isinstance(r, Exception)]
+        errors = [r for r in responses if isinstance(r, Exception)]
+        return operations, errors
 
     @classmethod
     def add_network_tag_if_not_exist(
@@ -1345,27 +1878,86 @@ class GCPTPUVMInstance(GCPInstance):
     ) -> None:
         # https://cloud.google.com/tpu/docs/reference/rest/v2alpha1/projects.locations.nodes  # pylint: disable=line-too-long
         # https://cloud.google.com/tpu/docs/reference/rest/v2alpha1/projects.locations.nodes/patch  # pylint: disable=line-too-long
-        del project_id, zone  # unused
+        key = (project_id, zone, instance, tag)
+        with _tagged_instances_lock:
+            if key in _tagged_instances:
+                return
+        nodes = cls._nodes()
         try:
-            response = cls.load_resource().projects().locations().nodes().get(
-                name=instance).execute()
+            response = nodes.get(name=instance, fields='tags').execute()
             existing_tags = response.get('tags', [])
-            if tag in existing_tags:
-                return
-            existing_tags.append(tag)
-            update_body = response
-            update_body['tags'] = existing_tags
-            cls.load_resource().projects().locations().nodes().patch(
-                name=instance,
-                body=update_body,
-                updateMask='tags',
-            ).execute()
+            if tag not in existing_tags:
+                existing_tags.append(tag)
+                nodes.patch(
+                    name=instance,
+                    body={
+                        'tags': existing_tags
+                    },
+                    updateMask='tags',
+                ).execute()
+            with _tagged_instances_lock:
+                _tagged_instances.add(key)
         except gcp.http_error_exception() as e:
             with ux_utils.print_exception_no_traceback():
                 raise ValueError(
                     f'Failed to add network tags for instance {instance}'
                 ) from e
 
+    @classmethod
+    def add_network_tag_if_not_exist_bulk(
+        cls,
+        project_id: str,
+        zone: str,
+        instances: List[str],
+        tag: str,
+    ) -> None:
+        """Adds the network tag to the TPU VMs with two batch requests.
+
+        One batch gets the current tags of all the nodes, and another one
+        patches the nodes that do not have the tag yet. The VPC names of the
+        nodes are cached from the same gets, for get_vpc_name().
+        """
+        with _tagged_instances_lock:
+            pending = [
+                instance for instance in instances
+                if (project_id, zone, instance, tag) not in _tagged_instances
+            ]
+        if not pending:
+            return
+        resource = cls.load_resource()
+        nodes = cls._nodes()
+        try:
+            responses = _execute_batch(resource, [
+                nodes.get(name=instance, fields='tags,networkConfig/network')
+                for instance in pending
+            ])
+            vpc_names = {
+                instance: selflink_to_name(response['networkConfig']['network'])
+                for instance, response in zip(pending, responses)
+                if 'network' in response.get('networkConfig', {})
+            }
+            with _tpu_vpc_names_lock:
+                _tpu_vpc_names.update(vpc_names)
+            patches = []
+            for instance, response in zip(pending, responses):
+                existing_tags = response.get('tags', [])
+                if tag in existing_tags:
+                    continue
+                patches.append(
+                    nodes.patch(
+                        name=instance,
+                        body={'tags': existing_tags + [tag]},
+                        updateMask='tags',
+                    ))
+            _execute_batch(resource, patches)
+        except gcp.http_error_exception() as e:
+            with ux_utils.print_exception_no_traceback():
+                raise ValueError('Failed to add network tags for instances '
+                                 f'{pending}') from e
+        with _tagged_instances_lock:
+            _tagged_instances.update(
+                (project_id, zone, instance, tag) for instance in pending)
+
     @classmethod
     def get_vpc_name(
         cls,
@@ -1374,20 +1966,41 @@ class GCPTPUVMInstance(GCPInstance):
         instance: str,
     ) -> str:
         del project_id, zone  # unused
+        with _tpu_vpc_names_lock:
+            vpc_name = _tpu_vpc_names.get(instance)
+        if vpc_name is not None:
+            return vpc_name
         try:
-            response = cls.load_resource().projects().locations().nodes().get(
-                name=instance).execute()
+            response = cls._nodes().get(
+                name=instance, fields='networkConfig/network').execute()
             vpc_link = response['networkConfig']['network']
-            return selflink_to_name(vpc_link)
         except gcp.http_error_exception() as e:
             with ux_utils.print_exception_no_traceback():
                 raise ValueError(
                     f'Failed to get VPC name for instance {instance}') from e
+        vpc_name = selflink_to_name(vpc_link)
+        with _tpu_vpc_names_lock:
+            _tpu_vpc_names[instance] = vpc_name
+        return vpc_name
 
     @classmethod
-    @_retry_on_gcp_http_exception('unable to queue the operation')
-    def set_labels(cls, project_id: str, availability_zone: str, node_id: str,
-                   labels: dict) -> None:
+    # Concurrent controllers may race on setting the labels of the same node,
+    # so decorrelate their retries.
+    @_retry_on_gcp_http_exception('unable to queue the operation',
+                                  retry_interval_s=1,
+                                  backoff='decorrelated_jitter')
+    def set_labels(cls,
+                   project_id: str,
+                   availability_zone: str,
+                   node_id: str,
+                   labels: dict,
+                   existing_labels: Optional[Dict[str, str]] = None) -> None:
+        """Adds labels to a TPU VM.
+
+        The current labels of the node are taken from ``existing_labels`` if
+        provided, or otherwise from the node listed while waiting for it to be
+        ready, so the node is not fetched again.
+        """
         while True:
             # wait until the instance become ready before setting labels
             # as Cloud TPU API does not allow setting labels on pending
@@ -1396,23 +2009,27 @@ class GCPTPUVMInstance(GCPInstance):
                 project_id=project_id,
                 zone=availability_zone,
                 label_filters=None,
-                status_filters=cls.PENDING_STATES,
+                status_filters=None,
                 included_instances=[node_id],
             )
-            if not instances:
+            node = instances.get(node_id)
+            if node is None or node.get('state') not in cls.PENDING_STATES:
                 break
             logger.debug(f'set_labels: Waiting for instance {node_id} to be '
                          'ready...')
             time.sleep(constants.POLL_INTERVAL)
 
-        node = (cls.load_resource().projects().locations().nodes().get(
-            name=node_id).execute(num_retries=GCP_CREATE_MAX_RETRIES))
+        if existing_labels is None:
+            if node is None:
+                node = (cls._nodes().get(name=node_id, fields='labels').execute(
+                    num_retries=GCP_CREATE_MAX_RETRIES))
+            existing_labels = node.get('labels', {})
         body = {
-            'labels': dict(node['labels'], **labels),
+            'labels': dict(existing_labels, **labels),
         }
         update_mask = 'labels'
 
-        operation = (cls.load_resource().projects().locations().nodes().patch(
+        operation = (cls._nodes().patch(
             name=node_id,
             updateMask=update_mask,
             body=body,
@@ -1436,16 +2053,8 @@ class GCPTPUVMInstance(GCPInstance):
         # removing Compute-specific default key set in config.py
         config.pop('networkInterfaces', None)
 
-        head_tag_needed = [False] * count
-        if include_head_node:
-            head_tag_needed[0] = True
-
-        names = []
-        for i in range(count):
-            names.append(
-                _generate_node_name(cluster_name,
-                                    GCPNodeType.TPU.value,
-                                    is_head=head_tag_needed[i]))
+        names = _generate_node_names(cluster_name, GCPNodeType.TPU.value, count,
+                                     include_head_node)
 
         labels = dict(config.get('labels', {}), **labels)
 
@@ -1485,12 +2094,11 @@ class GCPTPUVMInstance(GCPInstance):
                     provision_constants.WORKER_NODE_TAGS)
             try:
                 logger.debug('Launching GCP TPU VM ...')
-                request = (
-                    cls.load_resource().projects().locations().nodes().create(
-                        parent=f'projects/{project_id}/locations/{zone}',
-                        body=node_config,
-                        nodeId=name,
-                    ))
+                request = (cls._nodes().create(
+                    parent=f'projects/{project_id}/locations/{zone}',
+                    body=node_config,
+                    nodeId=name,
+                ))
                 operation = request.execute(num_retries=0)
                 operations.append(operation)
             except gcp.http_error_exception() as e:
@@ -1551,39 +2159,18 @@ class GCPTPUVMInstance(GCPInstance):
             return errors, names
 
         logger.debug('Waiting GCP instances to be ready ...')
-        wait_start = time.time()
-        success = [False] * len(operations)
-        results: List[dict] = [{} for _ in range(len(operations))]
-        while time.time() - wait_start < GCP_TIMEOUT:
-            # Retry the wait() call until it succeeds or times out.
-            # This is because the wait() call is only best effort, and does not
-            # guarantee that the operation is done when it returns.
-            # Reference: https://cloud.google.com/workflows/docs/reference/googleapis/compute/v1/zoneOperations/wait # pylint: disable=line-too-long
-            for i, operation in enumerate(operations):
-                if success[i]:
-                    continue
-                request = (
-                    cls.load_resource().projects().locations().operations().get(
-                        name=operation['name'],))
-                request.http.timeout = GCP_TIMEOUT - (time.time() - wait_start)
-                result = request.execute(num_retries=GCP_CREATE_MAX_RETRIES)
-                results[i] = result
-                success[i] = result['done']
-            if all(success):
-                logger.debug(f'create_instances: Finished {results}')
-                break
-            logger.debug('create_instances: Retry waiting for TPU operations '
-                         f'to finish: {results}...')
+        results = cls._poll_operations(operations, GCP_TIMEOUT)
+        success = [result.get('done', False) for result in results]
+        if all(success):
+            logger.debug(f'create_instances: Finished {results}')
         else:
             logger.warning('create_instances: Timeout waiting for TPU creation '
                            'operation, cancelling the operation ...')
             for i, operation in enumerate(operations):
                 if success[i]:
                     continue
-                request = cls.load_resource().projects().locations().operations(
-                ).cancel(name=operation['name'],)
-            request.http.timeout = GCP_TIMEOUT - (time.time() - wait_start)
-            request.execute(num_retries=GCP_CREATE_MAX_RETRIES)
+                cls._operations().cancel(name=operation['name']).execute(
+                    num_retries=GCP_CREATE_MAX_RETRIES)
             errors = [{
                 'code': 'TIMEOUT',
                 'message': 'Timeout waiting for creation operation',
@@ -1615,11 +2202,25 @@ class GCPTPUVMInstance(GCPInstance):
 
     @classmethod
     def start_instance(cls, node_id: str, project_id: str, zone: str) -> None:
-        operation = (cls.load_resource().projects().locations().nodes().start(
-            name=node_id).execute())
+        operation = (cls._nodes().start(name=node_id).execute())
 
         cls.wait_for_operation(operation, project_id, zone)
 
+    @classmethod
+    def start_instances(cls, cluster_name: str, project_id: str, zone: str,
+                        instances: List[str], labels: Dict[str,
+                                                           str]) -> List[str]:
+        """Start multiple TPU VMs, waiting for them together."""
+        del cluster_name  # Unused
+        nodes = cls._nodes()
+        operations = [
+            nodes.start(name=instance_id).execute() for instance_id in instances
+        ]
+        cls.wait_for_operations(operations, project_id, zone)
+        for instance_id in instances:
+            cls.set_labels(project_id, zone, instance_id, labels)
+        return instances
+
     @classmethod
     def resize_disk(cls, project_id: str, availability_zone: str,
                     node_config: dict, instance_name: str) -> None:
@@ -1635,8 +2236,7 @@ class GCPTPUVMInstance(GCPInstance):
     def get_instance_info(cls, project_id: str, availability_zone: str,
                           instance_id: str) -> List[common.InstanceInfo]:
         del project_id, availability_zone  # unused
-        result = cls.load_resource().projects().locations().nodes().get(
-            name=instance_id).execute()
+        result = cls._nodes().get(name=instance_id).execute()
         network_endpoints = result.get('networkEndpoints', [{}])
         external_ips = []
         internal_ips = []
@@ -1663,6 +2263,13 @@ class GCPNodeType(enum.Enum):
     TPU = 'tpu'
 
 
+# Bound once, so that get_node_type does not look up the enum members on
+# every call.
+_COMPUTE = GCPNodeType.COMPUTE
+_MIG = GCPNodeType.MIG
+_TPU = GCPNodeType.TPU
+
+
 def get_node_type(config: Dict[str, Any]) -> GCPNodeType:
     """Returns node type based on the keys in ``node``.
 
@@ -1673,7 +2280,9 @@ def get_node_type(config: Dict[str, Any]) -> GCPNodeType:
 
     This works for both node configs and API returned nodes.
     """
-    if ('machineType' not in config and 'acceleratorType' not in config):
+    if 'machineType' not in config:
+        if 'acceleratorType' in config:
+            return _TPU
         raise ValueError(
             'Invalid node. For a Compute instance, "machineType" is '
             'required. '
@@ -1681,15 +2290,12 @@ def get_node_type(config: Dict[str, Any]) -> GCPNodeType:
             'is required. '
             f'Got {list(config)}')
 
-    if 'machineType' not in config and 'acceleratorType' in config:
-        return GCPNodeType.TPU
-
     if (config.get(constants.MANAGED_INSTANCE_GROUP_CONFIG, None) is not None
             and config.get('guestAccelerators', None) is not None):
         # DWS in MIG only works for machine with GPUs.
-        return GCPNodeType.MIG
+        return _MIG
 
-    return GCPNodeType.COMPUTE
+    return _COMPUTE
 
 
 def create_tpu_node(project_id: str, zone: str, tpu_node_config: Dict[str, str],
@@ -1,8 +1,9 @@
 """Service specification for SkyServe."""
+import copy
+import functools
 import json
 import os
-import textwrap
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -13,11 +14,99 @@ from sky.serve import serve_utils
 from sky.utils import common_utils
 from sky.utils import schemas
 from sky.utils import ux_utils
+from sky.utils import validator
+
+# Use the libyaml-based loader if PyYAML is built with it, which is much
+# faster than the pure-Python one.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_yaml(path: str, stat_key: Tuple[int, int]) -> Any:
+    """Loads the YAML file, cached by the path and its (mtime, size)."""
+    del stat_key  # Only used as part of the cache key.
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_service_schema_validator():
+    """Returns the validator of the service schema, built once."""
+    return validator.SchemaValidator(schemas.get_service_schema())
+
+
+def _cached_str(
+    method: Callable[['SkyServiceSpec'],
+                     str]) -> Callable[['SkyServiceSpec'], str]:
+    """Caches a string of the spec that only depends on fields without setters.
+
+    The only mutable fields of a spec are ports and tls_credential, which the
+    cached strings do not depend on.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: 'SkyServiceSpec') -> str:
+        # pylint: disable=protected-access
+        value = self._str_cache.get(method.__name__)
+        if value is None:
+            value = method(self)
+            self._str_cache[method.__name__] = value
+        return value
+
+    return wrapper
 
 
 class SkyServiceSpec:
     """SkyServe service specification."""
 
+    __slots__ = (
+        '_readiness_path',
+        '_initial_delay_seconds',
+        '_readiness_timeout_seconds',
+        '_min_replicas',
+        '_max_replicas',
+        '_ports',
+        '_target_qps_per_replica',
+        '_post_data',
+        '_tls_credential',
+        '_readiness_headers',
+        '_dynamic_ondemand_fallback',
+        '_base_ondemand_fallback_replicas',
+        '_upscale_delay_seconds',
+        '_downscale_delay_seconds',
+        '_load_balancing_policy',
+        '_use_ondemand_fallback',
+        '_str_cache',
+    )
+
+    # (section, key, attribute) of the fields dumped by to_yaml_config() when
+    # they are not None, in order.
+    _YAML_FIELDS = (
+        ('readiness_probe', 'path', '_readiness_path'),
+        ('readiness_probe', 'initial_delay_seconds', '_initial_delay_seconds'),
+        ('readiness_probe', 'post_data', '_post_data'),
+        ('readiness_probe', 'timeout_seconds', '_readiness_timeout_seconds'),
+        ('readiness_probe', 'headers', '_readiness_headers'),
+        ('replica_policy', 'min_replicas', '_min_replicas'),
+        ('replica_policy', 'max_replicas', '_max_replicas'),
+        ('replica_policy', 'target_qps_per_replica', '_target_qps_per_replica'),
+        ('replica_policy', 'dynamic_ondemand_fallback',
+         '_dynamic_ondemand_fallback'),
+        ('replica_policy', 'base_ondemand_fallback_replicas',
+         '_base_ondemand_fallback_replicas'),
+        ('replica_policy', 'upscale_delay_seconds', '_upscale_delay_seconds'),
+        ('replica_policy', 'downscale_delay_seconds',
+         '_downscale_delay_seconds'),
+    )
+
+    _REPR_TEMPLATE = ('Readiness probe method:           {probe}\n'
+                      'Readiness initial delay seconds:  {initial_delay}\n'
+                      'Readiness probe timeout seconds:  {probe_timeout}\n'
+                      'Replica autoscaling policy:       {autoscaling_policy}\n'
+                      'TLS Certificates:                 {tls}\n'
+                      'Spot Policy:                      {spot_policy}\n'
+                      'Load Balancing Policy:            {lb_policy}\n')
+
     def __init__(
         self,
         readiness_path: str,
@@ -36,6 +125,38 @@ class SkyServiceSpec:
         downscale_delay_seconds: Optional[int] = None,
         load_balancing_policy: Optional[str] = None,
     ) -> None:
+        self._validate(readiness_path, min_replicas, max_replicas,
+                       target_qps_per_replica, load_balancing_policy)
+        self._readiness_path: str = readiness_path
+        self._initial_delay_seconds: int = initial_delay_seconds
+        self._readiness_timeout_seconds: int = readiness_timeout_seconds
+        self._min_replicas: int = min_replicas
+        self._max_replicas: Optional[int] = max_replicas
+        self._ports: Optional[str] = ports
+        self._target_qps_per_replica: Optional[float] = target_qps_per_replica
+        self._post_data: Optional[Dict[str, Any]] = post_data
+        self._tls_credential: Optional[serve_utils.TLSCredential] = (
+            tls_credential)
+        self._readiness_headers: Optional[Dict[str, str]] = readiness_headers
+        self._dynamic_ondemand_fallback: Optional[
+            bool] = dynamic_ondemand_fallback
+        self._base_ondemand_fallback_replicas: Optional[
+            int] = base_ondemand_fallback_replicas
+        self._upscale_delay_seconds: Optional[int] = upscale_delay_seconds
+        self._downscale_delay_seconds: Optional[int] = downscale_delay_seconds
+        self._load_balancing_policy: Optional[str] = load_balancing_policy
+
+        self._use_ondemand_fallback: bool = bool(dynamic_ondemand_fallback) or (
+            base_ondemand_fallback_replicas is not None and
+            base_ondemand_fallback_replicas > 0)
+        self._str_cache: Dict[str, str] = {}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _validate(readiness_path: str, min_replicas: int,
+                  max_replicas: Optional[int],
+                  target_qps_per_replica: Optional[float],
+                  load_balancing_policy: Optional[str]) -> None:
         if max_replicas is not None and max_replicas < min_replicas:
             with ux_utils.print_exception_no_traceback():
                 raise ValueError('max_replicas must be greater than or '
@@ -68,34 +189,10 @@ class SkyServiceSpec:
                 raise ValueError(
                     f'Unknown load balancing policy: {load_balancing_policy}. '
                     f'Available policies: {list(serve.LB_POLICIES.keys())}')
-        self._readiness_path: str = readiness_path
-        self._initial_delay_seconds: int = initial_delay_seconds
-        self._readiness_timeout_seconds: int = readiness_timeout_seconds
-        self._min_replicas: int = min_replicas
-        self._max_replicas: Optional[int] = max_replicas
-        self._ports: Optional[str] = ports
-        self._target_qps_per_replica: Optional[float] = target_qps_per_replica
-        self._post_data: Optional[Dict[str, Any]] = post_data
-        self._tls_credential: Optional[serve_utils.TLSCredential] = (
-            tls_credential)
-        self._readiness_headers: Optional[Dict[str, str]] = readiness_headers
-        self._dynamic_ondemand_fallback: Optional[
-            bool] = dynamic_ondemand_fallback
-        self._base_ondemand_fallback_replicas: Optional[
-            int] = base_ondemand_fallback_replicas
-        self._upscale_delay_seconds: Optional[int] = upscale_delay_seconds
-        self._downscale_delay_seconds: Optional[int] = downscale_delay_seconds
-        self._load_balancing_policy: Optional[str] = load_balancing_policy
-
-        self._use_ondemand_fallback: bool = (
-            self.dynamic_ondemand_fallback is not None and
-            self.dynamic_ondemand_fallback) or (
-                self.base_ondemand_fallback_replicas is not None and
-                self.base_ondemand_fallback_replicas > 0)
 
     @staticmethod
     def from_yaml_config(config: Dict[str, Any]) -> 'SkyServiceSpec':
-        common_utils.validate_schema(config, schemas.get_service_schema(),
+        common_utils.validate_schema(config, _get_service_schema_validator(),
                                      'Invalid service YAML: ')
         if 'replicas' in config and 'replica_policy' in config:
             with ux_utils.print_exception_no_traceback():
@@ -106,20 +203,16 @@ class SkyServiceSpec:
         service_config: Dict[str, Any] = {}
 
         readiness_section = config['readiness_probe']
+        # The readiness probe can be specified as only the path.
         if isinstance(readiness_section, str):
-            service_config['readiness_path'] = readiness_section
-            initial_delay_seconds = None
-            post_data = None
-            readiness_timeout_seconds = None
-            readiness_headers = None
-        else:
-            service_config['readiness_path'] = readiness_section['path']
-            initial_delay_seconds = readiness_section.get(
-                'initial_delay_seconds', None)
-            post_data = readiness_section.get('post_data', None)
-            readiness_timeout_seconds = readiness_section.get(
-                'timeout_seconds', None)
-            readiness_headers = readiness_section.get('headers', None)
+            readiness_section = {'path': readiness_section}
+        service_config['readiness_path'] = readiness_section['path']
+        initial_delay_seconds = readiness_section.get('initial_delay_seconds',
+                                                      None)
+        post_data = readiness_section.get('post_data', None)
+        readiness_timeout_seconds = readiness_section.get(
+            'timeout_seconds', None)
+        readiness_headers = readiness_section.get('headers', None)
         if initial_delay_seconds is None:
             initial_delay_seconds = constants.DEFAULT_INITIAL_DELAY_SECONDS
         service_config['initial_delay_seconds'] = initial_delay_seconds
@@ -148,32 +241,19 @@ class SkyServiceSpec:
         service_config['ports'] = str(ports) if ports is not None else None
 
         policy_section = config.get('replica_policy', None)
-        simplified_policy_section = config.get('replicas', None)
-        if policy_section is None or simplified_policy_section is not None:
-            if simplified_policy_section is not None:
-                min_replicas = simplified_policy_section
-            else:
+        if policy_section is None:
+            # The simplified `replicas: <n>` form, or the default, only sets
+            # a fixed number of replicas.
+            min_replicas = config.get('replicas', None)
+            if min_replicas is None:
                 min_replicas = constants.DEFAULT_MIN_REPLICAS
-            service_config['min_replicas'] = min_replicas
-            service_config['max_replicas'] = None
-            service_config['target_qps_per_replica'] = None
-            service_config['upscale_delay_seconds'] = None
-            service_config['downscale_delay_seconds'] = None
-        else:
-            service_config['min_replicas'] = policy_section['min_replicas']
-            service_config['max_replicas'] = policy_section.get(
-                'max_replicas', None)
-            service_config['target_qps_per_replica'] = policy_section.get(
-                'target_qps_per_replica', None)
-            service_config['upscale_delay_seconds'] = policy_section.get(
-                'upscale_delay_seconds', None)
-            service_config['downscale_delay_seconds'] = policy_section.get(
-                'downscale_delay_seconds', None)
-            service_config[
-                'base_ondemand_fallback_replicas'] = policy_section.get(
-                    'base_ondemand_fallback_replicas', None)
-            service_config['dynamic_ondemand_fallback'] = policy_section.get(
-                'dynamic_ondemand_fallback', None)
+            policy_section = {'min_replicas': min_replicas}
+        service_config['min_replicas'] = policy_section['min_replicas']
+        for key in ('max_replicas', 'target_qps_per_replica',
+                    'upscale_delay_seconds', 'downscale_delay_seconds',
+                    'base_ondemand_fallback_replicas',
+                    'dynamic_ondemand_fallback'):
+            service_config[key] = policy_section.get(key, None)
 
         service_config['load_balancing_policy'] = config.get(
             'load_balancing_policy', None)
@@ -189,8 +269,12 @@ class SkyServiceSpec:
 
     @staticmethod
     def from_yaml(yaml_path: str) -> 'SkyServiceSpec':
-        with open(os.path.expanduser(yaml_path), 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        path = os.path.expanduser(yaml_path)
+        stat = os.stat(path)
+        # Copy the cached config, as the spec keeps references to its values
+        # (e.g., post_data).
+        config = copy.deepcopy(
+            _load_yaml(path, (stat.st_mtime_ns, stat.st_size)))
 
         if isinstance(config, str):
             with ux_utils.print_exception_no_traceback():
@@ -209,49 +293,26 @@ class SkyServiceSpec:
 
     def to_yaml_config(self) -> Dict[str, Any]:
         config: Dict[str, Any] = {}
-
-        def add_if_not_none(section: str,
-                            key: Optional[str],
-                            value: Any,
-                            no_empty: bool = False):
-            if no_empty and not value:
-                return
+        for section, key, attr in self._YAML_FIELDS:
+            value = getattr(self, attr)
             if value is not None:
-                if key is None:
-                    config[section] = value
-                else:
-                    if section not in config:
-                        config[section] = dict()
-                    config[section][key] = value
-
-        add_if_not_none('readiness_probe', 'path', self.readiness_path)
-        add_if_not_none('readiness_probe', 'initial_delay_seconds',
-                        self.initial_delay_seconds)
-        add_if_not_none('readiness_probe', 'post_data', self.post_data)
-        add_if_not_none('readiness_probe', 'timeout_seconds',
-                        self.readiness_timeout_seconds)
-        add_if_not_none('readiness_probe', 'headers', self._readiness_headers)
-        add_if_not_none('replica_policy', 'min_replicas', self.min_replicas)
-        add_if_not_none('replica_policy', 'max_replicas', self.max_replicas)
-        add_if_not_none('replica_policy', 'target_qps_per_replica',
-                        self.target_qps_per_replica)
-        add_if_not_none('replica_policy', 'dynamic_ondemand_fallback',
-                        self.dynamic_ondemand_fallback)
-        add_if_not_none('replica_policy', 'base_ondemand_fallback_replicas',
-                        self.base_ondemand_fallback_replicas)
-        add_if_not_none('replica_policy', 'upscale_delay_seconds',
-                        self.upscale_delay_seconds)
-        add_if_not_none('replica_policy', 'downscale_delay_seconds',
-                        self.downscale_delay_seconds)
-        add_if_not_none('load_balancing_policy', None,
-                        self._load_balancing_policy)
-        add_if_not_none('ports', None, int(self.ports) if self.ports else None)
-        if self.tls_credential is not None:
-            add_if_not_none('tls', 'keyfile', self.tls_credential.keyfile)
-            add_if_not_none('tls', 'certfile', self.tls_credential.certfile)
+                config.setdefault(section, {})[key] = value
+        if self._load_balancing_policy is not None:
+            config['load_balancing_policy'] = self._load_balancing_policy
+        if self._ports:
+            config['ports'] = int(self._ports)
+        if self._tls_credential is not None:
+            tls_config = {
+                'keyfile': self._tls_credential.keyfile,
+                'certfile': self._tls_credential.certfile,
+            }
+            tls_config = {k: v for k, v in tls_config.items() if v is not None}
+            if tls_config:
+                config['tls'] = tls_config
         return config
 
-    def probe_str(self):
+    @_cached_str
+    def probe_str(self) -> str:
         if self.post_data is None:
             method = f'GET {self.readiness_path}'
         else:
@@ -260,6 +321,7 @@ class SkyServiceSpec:
                    ' with custom headers')
         return f'{method}{headers}'
 
+    @_cached_str
     def spot_policy_str(self) -> str:
         policy_strs: List[str] = []
         if (self.dynamic_ondemand_fallback is not None and
@@ -280,7 +342,8 @@ class SkyServiceSpec:
             return 'No spot fallback policy'
         return ' '.join(policy_strs)
 
-    def autoscaling_policy_str(self):
+    @_cached_str
+    def autoscaling_policy_str(self) -> str:
         # TODO(MaoZiming): Update policy_str
         min_plural = '' if self.min_replicas == 1 else 's'
         if self.max_replicas == self.min_replicas or self.max_replicas is None:
@@ -302,16 +365,28 @@ class SkyServiceSpec:
         return (f'Keyfile: {self.tls_credential.keyfile}, '
                 f'Certfile: {self.tls_credential.certfile}')
 
+    def __setstate__(self, state) -> None:
+        """Set state from pickled state, for backward compatibility."""
+        self._str_cache = {}
+        if isinstance(state, tuple):
+            # (None, slots state), as pickled with __slots__.
+            _, state = state
+        # Otherwise, the state is the __dict__ of a spec pickled before
+        # __slots__ was added, e.g., stored in the serve state database. Such
+        # a state may lack fields added later, or have fields since removed.
+        for slot in self.__slots__:
+            if slot != '_str_cache':
+                setattr(self, slot, state.get(slot))
+
     def __repr__(self) -> str:
-        return textwrap.dedent(f"""\
-            Readiness probe method:           {self.probe_str()}
-            Readiness initial delay seconds:  {self.initial_delay_seconds}
-            Readiness probe timeout seconds:  {self.readiness_timeout_seconds}
-            Replica autoscaling policy:       {self.autoscaling_policy_str()}
-            TLS Certificates:                 {self.tls_str()}
-            Spot Policy:                      {self.spot_policy_str()}
-            Load Balancing Policy:            {self.load_balancing_policy}
-        """)
+        return self._REPR_TEMPLATE.format(
+            probe=self.probe_str(),
+            initial_delay=self.initial_delay_seconds,
+            probe_timeout=self.readiness_timeout_seconds,
+            autoscaling_policy=self.autoscaling_policy_str(),
+            tls=self.tls_str(),
+            spot_policy=self.spot_policy_str(),
+            lb_policy=self.load_balancing_policy)
 
     @property
     def readiness_path(self) -> str:
@@ -548,7 +548,9 @@ def validate_schema(obj, schema, err_msg_prefix='', skip_none=True):
 
     Args:
         obj: The object to validate.
-        schema: The JSON schema against which to validate the object.
+        schema: The JSON schema against which to validate the object, or a
+          validator.SchemaValidator built from it, which can be reused across
+          calls to avoid rebuilding the validator.
         err_msg_prefix: The string to prepend to the error message if
           validation fails.
         skip_none: If True, removes fields with value None from the object
@@ -562,7 +564,9 @@ def validate_schema(obj, schema, err_msg_prefix='', skip_none=True):
         obj = {k: v for k, v in obj.items() if v is not None}
     err_msg = None
     try:
-        validator.SchemaValidator(schema).validate(obj)
+        if isinstance(schema, dict):
+            schema = validator.SchemaValidator(schema)
+        schema.validate(obj)
     except jsonschema.ValidationError as e:
         if e.validator == 'additionalProperties':
             if tuple(e.schema_path) == ('properties', 'envs',
@@ -1,9 +1,17 @@
+import copy
+import json
+import socket
+import threading
+from unittest import mock
 from unittest.mock import patch
 
+from googleapiclient import errors
+import httplib2
 import pytest
 
 from sky.clouds.gcp import GCP
 from sky.clouds.utils import gcp_utils
+from sky.provision.gcp import instance_utils
 
 
 @pytest.mark.parametrize((
@@ -110,3 +118,442 @@ def test_gcp_reservation_is_consumable(specific_reservations,
         zone='zone')
     assert r.is_consumable(
         specific_reservations=specific_reservations) is expected
+
+
+def _make_http_error(reason: str, status: int = 503):
+    resp = httplib2.Response({'status': status})
+    content = json.dumps({'error': {'code': status, 'message': reason}})
+    return errors.HttpError(resp, content.encode())
+
+
+def test_gcp_retry_on_http_exception_backoff():
+    calls = []
+
+    @instance_utils._retry_on_gcp_http_exception(max_retries=4,
+                                                 retry_interval_s=2,
+                                                 max_retry_interval_s=5)
+    def _always_fail():
+        calls.append(None)
+        raise _make_http_error('backend error')
+
+    with patch.object(instance_utils.time, 'sleep') as mock_sleep:
+        with pytest.raises(Exception):
+            _always_fail()
+    assert len(calls) == 4
+    # No sleep after the last attempt.
+    sleeps = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(sleeps) == 3
+    for attempt, sleep in enumerate(sleeps):
+        assert 0 <= sleep <= min(5, 2 * 2**attempt)
+
+
+def test_gcp_retry_on_http_exception_decorrelated_jitter():
+
+    @instance_utils._retry_on_gcp_http_exception(max_retries=6,
+                                                 retry_interval_s=1,
+                                                 max_retry_interval_s=30,
+                                                 backoff='decorrelated_jitter')
+    def _always_fail():
+        raise _make_http_error('backend error')
+
+    with patch.object(instance_utils.time, 'sleep') as mock_sleep:
+        with pytest.raises(Exception):
+            _always_fail()
+    sleeps = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(sleeps) == 5
+    previous = 1
+    for sleep in sleeps:
+        assert 1 <= sleep <= min(30, previous * 3)
+        previous = sleep
+
+
+def test_gcp_load_resource_cached_per_thread():
+    instance_utils._reset_resource_cache()
+    with patch.object(instance_utils.gcp,
+                      'build',
+                      side_effect=lambda *args, **kwargs: object()), \
+            patch.object(instance_utils.gcp, 'authorized_http'):
+        resource = instance_utils.GCPComputeInstance.load_resource()
+        assert instance_utils.GCPComputeInstance.load_resource() is resource
+        assert instance_utils.GCPTPUVMInstance.load_resource() is not resource
+
+        other_thread_resources = []
+        thread = threading.Thread(target=lambda: other_thread_resources.append(
+            instance_utils.GCPComputeInstance.load_resource()))
+        thread.start()
+        thread.join()
+        assert other_thread_resources[0] is not resource
+    instance_utils._reset_resource_cache()
+
+
+def test_gcp_copy_node_config_does_not_mutate_input():
+    node_config = {
+        'machineType': 'zones/us-central1-a/machineTypes/n1-standard-8',
+        'guestAccelerators': [{
+            'acceleratorType': 'projects/p/zones/us-central1-a/acceleratorTypes/nvidia-t4',
+            'acceleratorCount': 1,
+        }],
+        'disks': [{
+            'boot': True,
+            'initializeParams': {
+                'diskType': 'zones/us-central1-a/diskTypes/pd-balanced',
+            },
+        }],
+        'metadata': {
+            'items': [{
+                'key': 'startup-script',
+                'value': 'echo hi'
+            }]
+        },
+    }
+    original = copy.deepcopy(node_config)
+    config = instance_utils._copy_node_config(node_config)
+    instance_utils.GCPComputeInstance._convert_selflinks_in_config(config)
+    assert config['machineType'] == 'n1-standard-8'
+    assert config['guestAccelerators'][0]['acceleratorType'] == 'nvidia-t4'
+    assert config['disks'][0]['initializeParams']['diskType'] == 'pd-balanced'
+    assert node_config == original
+
+
+class _FakeBatch:
+
+    def __init__(self, callback, execute_errors):
+        self._callback = callback
+        self._execute_errors = execute_errors
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        if self._execute_errors:
+            raise self._execute_errors.pop(0)
+        for request_id, request in self._requests:
+            if isinstance(request, Exception):
+                self._callback(request_id, None, request)
+            else:
+                self._callback(request_id, request, None)
+
+
+class _FakeResource:
+
+    def __init__(self):
+        self.num_batches = 0
+        # Errors raised by the next executions of the batch requests.
+        self.execute_errors = []
+        self.nodes = mock.MagicMock()
+        self.operations = mock.MagicMock()
+
+    def new_batch_http_request(self, callback):
+        self.num_batches += 1
+        return _FakeBatch(callback, self.execute_errors)
+
+
+@pytest.fixture
+def compute_resource():
+    """Fixture for a mock resource of the compute API."""
+    resource = mock.MagicMock()
+    with patch.object(instance_utils.GCPComputeInstance,
+                      'load_resource',
+                      return_value=resource):
+        yield resource
+
+
+@pytest.fixture
+def tpu_resource():
+    """Fixture for a fake resource of the TPU API, with mock collections."""
+    resource = _FakeResource()
+    with patch.object(instance_utils.GCPTPUVMInstance,
+                      'load_resource',
+                      return_value=resource), \
+            patch.object(instance_utils.GCPTPUVMInstance,
+                         '_nodes',
+                         return_value=resource.nodes), \
+            patch.object(instance_utils.GCPTPUVMInstance,
+                         '_operations',
+                         return_value=resource.operations):
+        yield resource
+
+
+def test_gcp_execute_batch():
+    resource = _FakeResource()
+    requests = [{'name': f'instance-{i}'} for i in range(5)]
+    with patch.object(instance_utils, 'GCP_MAX_BATCH_SIZE', 2):
+        responses = instance_utils._execute_batch(resource, requests)
+    assert responses == requests
+    assert resource.num_batches == 3
+
+    error = ValueError('failed')
+    with pytest.raises(ValueError):
+        instance_utils._execute_batch(_FakeResource(), [{
+            'name': 'instance-0'
+        }, error])
+
+
+def test_gcp_generate_node_names():
+    names = instance_utils._generate_node_names('cluster',
+                                                'compute',
+                                                count=3,
+                                                include_head_node=True)
+    assert len(names) == 3
+    assert len(set(names)) == 3
+    assert names[0].startswith('cluster-head-')
+    for name in names[1:]:
+        assert name.startswith('cluster-worker-')
+    for name in names:
+        assert name.endswith('-compute')
+        suffix_id = name.split('-')[2]
+        assert len(suffix_id) == instance_utils.INSTANCE_NAME_UUID_LEN
+
+
+def test_gcp_delete_firewall_rule_not_found(compute_resource):
+    firewalls_api = compute_resource.firewalls.return_value
+    firewalls_api.delete.return_value.execute.side_effect = _make_http_error(
+        'The resource \'projects/p/global/firewalls/rule\' was not found')
+    # A missing firewall rule is not an error.
+    instance_utils.GCPComputeInstance.delete_firewall_rule('p', 'rule')
+
+    firewalls_api.delete.return_value.execute.side_effect = _make_http_error(
+        'Internal error')
+    with pytest.raises(instance_utils.gcp.http_error_exception()):
+        instance_utils.GCPComputeInstance.delete_firewall_rule('p', 'rule')
+    firewalls_api.list.assert_not_called()
+
+
+def test_gcp_add_network_tag_if_not_exist_skips_known_tags(compute_resource):
+    instances_api = compute_resource.instances.return_value
+    instances_api.get.return_value.execute.return_value = {
+        'tags': {
+            'items': ['existing'],
+            'fingerprint': 'abc'
+        }
+    }
+    with patch.object(instance_utils, '_tagged_instances', set()):
+        for _ in range(2):
+            instance_utils.GCPComputeInstance.add_network_tag_if_not_exist(
+                'p', 'zone', 'instance-tag-test', 'new-tag')
+    assert instances_api.get.call_count == 1
+    assert instances_api.setTags.call_count == 1
+    body = instances_api.setTags.call_args.kwargs['body']
+    assert body['items'] == ['existing', 'new-tag']
+    assert instances_api.get.call_args.kwargs['fields'] == 'tags'
+
+
+def test_gcp_get_vpc_name_requests_partial_response(compute_resource):
+    instances_api = compute_resource.instances.return_value
+    instances_api.get.return_value.execute.return_value = {
+        'networkInterfaces': [{
+            'network': 'projects/p/global/networks/my-vpc'
+        }]
+    }
+    vpc_name = instance_utils.GCPComputeInstance.get_vpc_name(
+        'p', 'zone', 'instance')
+    assert vpc_name == 'my-vpc'
+    assert (instances_api.get.call_args.kwargs['fields'] ==
+            'networkInterfaces(network)')
+
+
+def test_gcp_add_network_tag_and_get_vpc_name_shares_get(compute_resource):
+    instances_api = compute_resource.instances.return_value
+    instances_api.get.return_value.execute.return_value = {
+        'tags': {
+            'fingerprint': 'abc'
+        },
+        'networkInterfaces': [{
+            'network': 'projects/p/global/networks/my-vpc'
+        }]
+    }
+    with patch.object(instance_utils, '_tagged_instances', set()):
+        vpc_name = (
+            instance_utils.GCPComputeInstance.add_network_tag_and_get_vpc_name(
+                'p', 'zone', ['instance'], 'new-tag'))
+    assert vpc_name == 'my-vpc'
+    instances_api.get.assert_called_once()
+    assert (instances_api.get.call_args.kwargs['fields'] ==
+            'tags,networkInterfaces(network)')
+    body = instances_api.setTags.call_args.kwargs['body']
+    assert body == {'fingerprint': 'abc', 'items': ['new-tag']}
+
+
+def test_gcp_tpu_nodes_collection_cached():
+    instance_utils._reset_resource_cache()
+    resource = mock.MagicMock()
+    with patch.object(instance_utils.GCPTPUVMInstance,
+                      'load_resource',
+                      return_value=resource):
+        nodes = instance_utils.GCPTPUVMInstance._nodes()
+        assert instance_utils.GCPTPUVMInstance._nodes() is nodes
+    assert resource.projects.call_count == 1
+    new_resource = mock.MagicMock()
+    with patch.object(instance_utils.GCPTPUVMInstance,
+                      'load_resource',
+                      return_value=new_resource):
+        assert instance_utils.GCPTPUVMInstance._nodes() is not nodes
+    instance_utils._reset_resource_cache()
+
+
+def test_gcp_tpu_add_network_tag_bulk(tpu_resource):
+    tags = {'node-0': ['new-tag'], 'node-1': [], 'node-2': ['other']}
+    nodes = tpu_resource.nodes
+    nodes.get.side_effect = lambda name, fields: {'tags': list(tags[name])}
+    nodes.patch.side_effect = lambda name, body, updateMask: {'name': name}
+    with patch.object(instance_utils, '_tagged_instances', set()):
+        for _ in range(2):
+            instance_utils.GCPTPUVMInstance.add_network_tag_if_not_exist_bulk(
+                'p', 'zone', list(tags), 'new-tag')
+    # One batch for the gets and one for the patches.
+    assert tpu_resource.num_batches == 2
+    assert nodes.get.call_count == 3
+    assert (
+        nodes.get.call_args.kwargs['fields'] == 'tags,networkConfig/network')
+    patched = {
+        c.kwargs['name']: c.kwargs['body']['tags']
+        for c in nodes.patch.call_args_list
+    }
+    assert patched == {'node-1': ['new-tag'], 'node-2': ['other', 'new-tag']}
+
+
+def test_gcp_tpu_wait_for_operations_batches_polls(tpu_resource):
+    # op-0 finishes on the first poll, op-1 on the third poll.
+    polls = {'op-0': 1, 'op-1': 3}
+    num_gets = {'op-0': 0, 'op-1': 0}
+
+    def get(name):
+        num_gets[name] += 1
+        return {'name': name, 'done': num_gets[name] >= polls[name]}
+
+    tpu_resource.operations.get.side_effect = get
+    with patch.object(instance_utils.time, 'sleep') as mock_sleep:
+        instance_utils.GCPTPUVMInstance.wait_for_operations([{
+            'name': 'op-0'
+        }, {
+            'name': 'op-1'
+        }], 'p', 'zone')
+    assert tpu_resource.num_batches == 3
+    assert num_gets == {'op-0': 1, 'op-1': 3}
+    sleeps = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(sleeps) == 2
+    for attempt, sleep in enumerate(sleeps):
+        interval = instance_utils.GCP_OPERATION_POLL_INTERVAL_SECONDS * 2**attempt
+        assert interval / 2 <= sleep <= interval
+
+
+def test_gcp_tpu_wait_for_operations_retries_transient_errors(tpu_resource):
+    transient_error = _make_http_error('backend error', status=503)
+    operations_api = tpu_resource.operations
+    operations_api.get.side_effect = [
+        transient_error, {
+            'name': 'op-0',
+            'done': True
+        }
+    ]
+    with patch.object(instance_utils.time, 'sleep'):
+        instance_utils.GCPTPUVMInstance.wait_for_operations([{
+            'name': 'op-0'
+        }], 'p', 'zone')
+        assert operations_api.get.call_count == 2
+
+        operations_api.get.side_effect = [
+            _make_http_error('permission denied', status=403)
+        ]
+        with pytest.raises(errors.HttpError):
+            instance_utils.GCPTPUVMInstance.wait_for_operations([{
+                'name': 'op-0'
+            }], 'p', 'zone')
+        assert operations_api.get.call_count == 3
+
+
+def test_gcp_tpu_wait_for_operations_retries_connection_errors(tpu_resource):
+    tpu_resource.execute_errors.append(socket.timeout('timed out'))
+    tpu_resource.operations.get.side_effect = lambda name: {
+        'name': name,
+        'done': True
+    }
+    with patch.object(instance_utils.time, 'sleep'):
+        instance_utils.GCPTPUVMInstance.wait_for_operations([{
+            'name': 'op-0'
+        }], 'p', 'zone')
+    assert tpu_resource.num_batches == 2
+
+
+def test_gcp_tpu_terminate_many_batches_deletes(tpu_resource):
+    error = _make_http_error('node not found', status=404)
+    tpu_resource.nodes.delete.side_effect = lambda name: (
+        error if name == 'node-1' else {
+            'name': f'op-{name}'
+        })
+    operations, delete_errors = instance_utils.GCPTPUVMInstance.terminate_many(
+        'p', 'zone', ['node-0', 'node-1', 'node-2'])
+    assert operations == [{'name': 'op-node-0'}, {'name': 'op-node-2'}]
+    assert delete_errors == [error]
+    assert tpu_resource.num_batches == 1
+    with pytest.raises(errors.HttpError):
+        instance_utils.GCPTPUVMInstance.terminate('p', 'zone', 'node-1')
+
+
+def test_gcp_tpu_set_labels_uses_listed_labels(tpu_resource):
+    node_id = 'projects/p/locations/zone/nodes/node-0'
+    with patch.object(instance_utils.GCPTPUVMInstance,
+                      'filter',
+                      return_value={
+                          node_id: {
+                              'name': node_id,
+                              'state': 'READY',
+                              'labels': {
+                                  'a': '1'
+                              },
+                          }
+                      }), \
+            patch.object(instance_utils.GCPTPUVMInstance,
+                         'wait_for_operation'):
+        instance_utils.GCPTPUVMInstance.set_labels('p', 'zone', node_id,
+                                                   {'b': '2'})
+    tpu_resource.nodes.get.assert_not_called()
+    body = tpu_resource.nodes.patch.call_args.kwargs['body']
+    assert body == {'labels': {'a': '1', 'b': '2'}}
+
+
+@pytest.mark.parametrize(('config', 'expected'), [
+    ({
+        'machineType': 'n1-standard-8'
+    }, instance_utils.GCPNodeType.COMPUTE),
+    ({
+        'machineType': 'n1-standard-8',
+        'acceleratorType': 'v2-8'
+    }, instance_utils.GCPNodeType.COMPUTE),
+    ({
+        'acceleratorType': 'v2-8'
+    }, instance_utils.GCPNodeType.TPU),
+    ({
+        'machineType': 'a2-highgpu-1g',
+        'guestAccelerators': [],
+        instance_utils.constants.MANAGED_INSTANCE_GROUP_CONFIG: {},
+    }, instance_utils.GCPNodeType.MIG),
+])
+def test_gcp_get_node_type(config, expected):
+    assert instance_utils.get_node_type(config) is expected
+
+
+def test_gcp_get_node_type_invalid():
+    with pytest.raises(ValueError, match='Invalid node'):
+        instance_utils.get_node_type({'name': 'node'})
+
+
+def test_gcp_tpu_add_network_tag_bulk_caches_vpc_names(tpu_resource):
+    nodes = tpu_resource.nodes
+    nodes.get.side_effect = lambda name, **kwargs: {
+        'tags': ['new-tag'],
+        'networkConfig': {
+            'network': f'projects/p/global/networks/vpc-{name}'
+        }
+    }
+    with patch.object(instance_utils, '_tagged_instances', set()), \
+            patch.dict(instance_utils._tpu_vpc_names, clear=True):
+        instance_utils.GCPTPUVMInstance.add_network_tag_if_not_exist_bulk(
+            'p', 'zone', ['node-0', 'node-1'], 'new-tag')
+        # The VPC names are cached from the batched gets of the tags.
+        assert instance_utils.GCPTPUVMInstance.get_vpc_name(
+            'p', 'zone', 'node-1') == 'vpc-node-1'
+    assert nodes.get.call_count == 2
+    # No node needs a patch.
+    assert tpu_resource.num_batches == 1
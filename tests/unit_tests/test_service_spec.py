@@ -0,0 +1,180 @@
+import pickle
+import textwrap
+
+import pytest
+
+from sky.serve import constants
+from sky.serve import service_spec
+
+
+def _write_service_yaml(path, min_replicas: int) -> None:
+    path.write_text(
+        textwrap.dedent(f"""\
+            service:
+              readiness_probe:
+                path: /health
+                post_data:
+                  model: m
+              replicas: {min_replicas}
+            """))
+
+
+def test_from_yaml_reloads_changed_file(tmp_path):
+    yaml_path = tmp_path / 'service.yaml'
+    _write_service_yaml(yaml_path, 1)
+    spec = service_spec.SkyServiceSpec.from_yaml(str(yaml_path))
+    assert spec.min_replicas == 1
+    assert spec.post_data == {'model': 'm'}
+
+    # Mutating a loaded spec does not affect the cached config.
+    spec.post_data['model'] = 'other'
+    spec = service_spec.SkyServiceSpec.from_yaml(str(yaml_path))
+    assert spec.post_data == {'model': 'm'}
+
+    _write_service_yaml(yaml_path, 22)
+    spec = service_spec.SkyServiceSpec.from_yaml(str(yaml_path))
+    assert spec.min_replicas == 22
+
+
+def test_to_yaml_config_round_trip():
+    config = {
+        'readiness_probe': {
+            'path': '/health',
+            'initial_delay_seconds': 30,
+            'post_data': {
+                'model': 'm'
+            },
+            'timeout_seconds': 10,
+        },
+        'replica_policy': {
+            'min_replicas': 1,
+            'max_replicas': 3,
+            'target_qps_per_replica': 2.5,
+            'upscale_delay_seconds': 60,
+        },
+        'load_balancing_policy': 'round_robin',
+        'ports': 8080,
+        'tls': {
+            'keyfile': '/tmp/key.pem',
+            'certfile': '/tmp/cert.pem',
+        },
+    }
+    spec = service_spec.SkyServiceSpec.from_yaml_config(config)
+    assert spec.to_yaml_config() == config
+    assert list(spec.to_yaml_config()) == list(config)
+
+
+def test_init_validation_errors_are_not_cached():
+    for _ in range(2):
+        with pytest.raises(ValueError, match='max_replicas must be greater'):
+            service_spec.SkyServiceSpec(readiness_path='/',
+                                        initial_delay_seconds=1,
+                                        readiness_timeout_seconds=1,
+                                        min_replicas=3,
+                                        max_replicas=2,
+                                        target_qps_per_replica=1)
+
+
+def test_from_yaml_config_invalid_field():
+    with pytest.raises(ValueError, match='Invalid service YAML'):
+        service_spec.SkyServiceSpec.from_yaml_config({
+            'readiness_probe': '/health',
+            'replica': 2,
+        })
+
+
+def test_pickle_round_trip():
+    spec = service_spec.SkyServiceSpec(readiness_path='/health',
+                                       initial_delay_seconds=10,
+                                       readiness_timeout_seconds=5,
+                                       min_replicas=1,
+                                       max_replicas=3,
+                                       target_qps_per_replica=1.0)
+    loaded = pickle.loads(pickle.dumps(spec))
+    assert loaded.to_yaml_config() == spec.to_yaml_config()
+    assert not hasattr(loaded, '__dict__')
+
+    # Specs pickled before __slots__ was added have a dict state.
+    legacy = object.__new__(service_spec.SkyServiceSpec)
+    legacy.__setstate__({slot: getattr(spec, slot) for slot in spec.__slots__})
+    assert legacy.to_yaml_config() == spec.to_yaml_config()
+
+
+def test_unpickle_legacy_state_with_unknown_and_missing_fields():
+    spec = service_spec.SkyServiceSpec(readiness_path='/health',
+                                       initial_delay_seconds=10,
+                                       readiness_timeout_seconds=5,
+                                       min_replicas=1)
+    state = {slot: getattr(spec, slot) for slot in spec.__slots__}
+    # A field removed since the spec was pickled.
+    state['_auto_restart'] = True
+    # A field added since the spec was pickled.
+    del state['_tls_credential']
+    legacy = object.__new__(service_spec.SkyServiceSpec)
+    legacy.__setstate__(state)
+    assert not hasattr(legacy, '_auto_restart')
+    assert legacy.tls_credential is None
+    assert legacy.to_yaml_config() == spec.to_yaml_config()
+
+
+def test_repr():
+    spec = service_spec.SkyServiceSpec(readiness_path='/health',
+                                       initial_delay_seconds=10,
+                                       readiness_timeout_seconds=5,
+                                       min_replicas=2)
+    assert repr(spec) == (
+        'Readiness probe method:           GET /health\n'
+        'Readiness initial delay seconds:  10\n'
+        'Readiness probe timeout seconds:  5\n'
+        'Replica autoscaling policy:       Fixed 2 replicas\n'
+        'TLS Certificates:                 No TLS Enabled\n'
+        'Spot Policy:                      No spot fallback policy\n'
+        f'Load Balancing Policy:            {spec.load_balancing_policy}\n')
+
+
+def test_policy_strs_are_cached():
+    spec = service_spec.SkyServiceSpec(readiness_path='/health',
+                                       initial_delay_seconds=10,
+                                       readiness_timeout_seconds=5,
+                                       min_replicas=1,
+                                       max_replicas=3,
+                                       target_qps_per_replica=1.0,
+                                       post_data={'model': 'm'})
+    probe = spec.probe_str()
+    assert probe == 'POST /health {"model": "m"}'
+    assert spec.probe_str() is probe
+    assert spec.autoscaling_policy_str() is spec.autoscaling_policy_str()
+    assert spec.spot_policy_str() == 'No spot fallback policy'
+    loaded = pickle.loads(pickle.dumps(spec))
+    assert loaded.probe_str() == probe
+
+
+@pytest.mark.parametrize(('config', 'expected'), [
+    ({
+        'readiness_probe': '/health',
+    }, (constants.DEFAULT_MIN_REPLICAS, None)),
+    ({
+        'readiness_probe': '/health',
+        'replicas': None,
+    }, (constants.DEFAULT_MIN_REPLICAS, None)),
+    ({
+        'readiness_probe': '/health',
+        'replicas': 3,
+    }, (3, None)),
+    ({
+        'readiness_probe': {
+            'path': '/health'
+        },
+        'replica_policy': {
+            'min_replicas': 1,
+            'max_replicas': 4,
+            'target_qps_per_replica': 2,
+        },
+    }, (1, 4)),
+])
+def test_from_yaml_config_replicas(config, expected):
+    spec = service_spec.SkyServiceSpec.from_yaml_config(config)
+    assert (spec.min_replicas, spec.max_replicas) == expected
+    assert spec.readiness_path == '/health'
+    assert (
+        spec.initial_delay_seconds == constants.DEFAULT_INITIAL_DELAY_SECONDS)